@@ -0,0 +1,293 @@
+"""
+Percentile/CDF analytics of the collected FCT and goodput results.
+Columns from collector.py are summarized per scenario (p50/p95/p99/p99.9,
+CDFs, share of flows over a threshold). QuantileSketch keeps log-spaced
+buckets with a bounded relative error, so sweeps too large for memory are
+summarized file by file. Two runs are compared with Mann-Whitney U and
+Kolmogorov-Smirnov tests, from scipy when it is installed.
+"""
+from __future__ import division
+
+import argparse
+import math
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
+import collector
+
+try:
+	from scipy import stats as scipy_stats
+except ImportError:
+	scipy_stats = None
+
+
+PERCENTILES = (50, 95, 99, 99.9)
+
+
+def percentiles(values, qs=PERCENTILES):
+	"""
+		Get {q:value,} of values, nan for an empty array.
+	"""
+	values = np.asarray(values, dtype=np.float64)
+	if not len(values):
+		return dict((q, float('nan')) for q in qs)
+	return dict(zip(qs, np.percentile(values, qs).tolist()))
+
+
+def cdf(values):
+	"""
+		Get (sorted values, cumulative fraction) of values.
+	"""
+	x = np.sort(np.asarray(values, dtype=np.float64))
+	y = np.arange(1, len(x) + 1) / float(len(x)) if len(x) else np.zeros(0)
+	return x, y
+
+
+def summarize(columns, threshold=None, qs=PERCENTILES):
+	"""
+		Get {scenario:{'count', 'mean', 'percentiles', 'over'},} of the
+		columns of collector.collect; 'over' is the share of values
+		above threshold. The '' scenario holds every value.
+	"""
+	values = columns['value']
+	scenarios = columns['scenario']
+	result = {}
+	for scenario in [''] + sorted(set(scenarios.tolist()) - set([''])):
+		v = values if scenario == '' else values[scenarios == scenario]
+		entry = {'count': len(v),
+				 'mean': float(v.mean()) if len(v) else float('nan'),
+				 'percentiles': percentiles(v, qs)}
+		if threshold is not None:
+			entry['over'] = float((v > threshold).mean()) if len(v) else float('nan')
+		result[scenario] = entry
+	return result
+
+
+def scenario_cdfs(columns):
+	"""
+		Get {scenario:(x, y),} of the columns of collector.collect.
+	"""
+	scenarios = columns['scenario']
+	return dict((scenario, cdf(columns['value'][scenarios == scenario]))
+				for scenario in sorted(set(scenarios.tolist())))
+
+
+class QuantileSketch(object):
+	"""
+		Log-bucket quantile sketch (as DDSketch): a positive value x goes
+		to bucket ceil(log_gamma(x)), gamma = (1 + alpha) / (1 - alpha),
+		so any quantile is returned within relative error alpha.
+		self.buckets = {index:count,}
+	"""
+
+	def __init__(self, alpha=0.01):
+		self.alpha = alpha
+		self.gamma = (1 + alpha) / (1 - alpha)
+		self.log_gamma = math.log(self.gamma)
+		self.buckets = {}
+		self.zeros = 0
+		self.count = 0
+		self.total = 0.0
+		self.min = float('inf')
+		self.max = float('-inf')
+
+	def add(self, values):
+		"""
+			Add an array of non-negative values.
+		"""
+		values = np.asarray(values, dtype=np.float64).ravel()
+		if not len(values):
+			return
+		self.count += len(values)
+		self.total += float(values.sum())
+		self.min = min(self.min, float(values.min()))
+		self.max = max(self.max, float(values.max()))
+		positive = values[values > 0]
+		self.zeros += len(values) - len(positive)
+		if len(positive):
+			index = np.ceil(np.log(positive) / self.log_gamma).astype(np.int64)
+			keys, counts = np.unique(index, return_counts=True)
+			for key, n in zip(keys.tolist(), counts.tolist()):
+				self.buckets[key] = self.buckets.get(key, 0) + n
+
+	def merge(self, other):
+		if other.gamma != self.gamma:
+			raise ValueError("sketches with different alpha")
+		for key, n in other.buckets.items():
+			self.buckets[key] = self.buckets.get(key, 0) + n
+		self.zeros += other.zeros
+		self.count += other.count
+		self.total += other.total
+		self.min = min(self.min, other.min)
+		self.max = max(self.max, other.max)
+
+	def quantile(self, q):
+		"""
+			Get the q-th percentile (0..100), nan when empty.
+		"""
+		if not self.count:
+			return float('nan')
+		rank = q / 100.0 * (self.count - 1)
+		if rank < self.zeros:
+			return 0.0
+		seen = self.zeros
+		for key in sorted(self.buckets):
+			seen += self.buckets[key]
+			if seen > rank:
+				value = 2 * self.gamma ** key / (self.gamma + 1)
+				return min(max(value, self.min), self.max)
+		return self.max
+
+	def percentiles(self, qs=PERCENTILES):
+		return dict((q, self.quantile(q)) for q in qs)
+
+	def mean(self):
+		return self.total / self.count if self.count else float('nan')
+
+
+def _sketch_one(args):
+	kind, path, alpha = args
+	name = os.path.basename(path)
+	sketch = QuantileSketch(alpha)
+	sketch.add(collector.READERS[kind](path))
+	return collector.parse_file_meta(name)['scenario'], sketch
+
+
+def sketch_directory(directory, kind, alpha=0.01, processes=None):
+	"""
+		Build {scenario:QuantileSketch,} ('' for all) of a result directory
+		without keeping its values: every file is reduced to a sketch in
+		the pool and merged.
+	"""
+	jobs = [(kind, os.path.join(directory, name), alpha)
+			for name in sorted(os.listdir(directory))]
+	sketches = {'': QuantileSketch(alpha)}
+	pool = Pool(processes)
+	try:
+		for scenario, sketch in pool.imap_unordered(_sketch_one, jobs, 32):
+			sketches[''].merge(sketch)
+			if scenario:
+				sketches.setdefault(scenario, QuantileSketch(alpha)).merge(sketch)
+	finally:
+		pool.close()
+		pool.join()
+	return sketches
+
+
+def mann_whitney(a, b):
+	"""
+		Two-sided Mann-Whitney U test. Return (U of a, p-value); the
+		fallback uses the tie-corrected normal approximation.
+	"""
+	a = np.asarray(a, dtype=np.float64)
+	b = np.asarray(b, dtype=np.float64)
+	if scipy_stats is not None:
+		u, p = scipy_stats.mannwhitneyu(a, b, alternative='two-sided')
+		return float(u), float(p)
+	n1, n2 = len(a), len(b)
+	ranks = _rankdata(np.concatenate([a, b]))
+	u = ranks[:n1].sum() - n1 * (n1 + 1) / 2.0
+	_, ties = np.unique(np.concatenate([a, b]), return_counts=True)
+	n = n1 + n2
+	var = n1 * n2 / 12.0 * ((n + 1) - (ties ** 3 - ties).sum() / float(n * (n - 1)))
+	if var <= 0:
+		return float(u), 1.0
+	z = (abs(u - n1 * n2 / 2.0) - 0.5) / math.sqrt(var)
+	return float(u), float(math.erfc(max(z, 0) / math.sqrt(2)))
+
+
+def ks_2samp(a, b):
+	"""
+		Two-sample Kolmogorov-Smirnov test. Return (D, p-value); the
+		fallback uses the asymptotic distribution.
+	"""
+	a = np.sort(np.asarray(a, dtype=np.float64))
+	b = np.sort(np.asarray(b, dtype=np.float64))
+	if scipy_stats is not None:
+		d, p = scipy_stats.ks_2samp(a, b)
+		return float(d), float(p)
+	x = np.concatenate([a, b])
+	d = float(np.abs(np.searchsorted(a, x, side='right') / float(len(a)) -
+					 np.searchsorted(b, x, side='right') / float(len(b))).max())
+	en = math.sqrt(len(a) * len(b) / float(len(a) + len(b)))
+	lam = (en + 0.12 + 0.11 / en) * d
+	p = 2 * sum((-1) ** (j - 1) * math.exp(-2 * j * j * lam * lam) for j in range(1, 101))
+	return d, float(min(max(p, 0.0), 1.0))
+
+
+def _rankdata(values):
+	order = np.argsort(values, kind='mergesort')
+	ranks = np.empty(len(values), dtype=np.float64)
+	sorted_values = values[order]
+	# Average ranks over runs of equal values.
+	starts = np.concatenate([[0], np.flatnonzero(np.diff(sorted_values)) + 1])
+	ends = np.concatenate([starts[1:], [len(values)]])
+	ranks[order] = np.repeat((starts + ends + 1) / 2.0, ends - starts)
+	return ranks
+
+
+def compare(baseline, candidate, qs=PERCENTILES, alpha=0.05):
+	"""
+		Compare two value arrays (e.g. FCT of a baseline and a candidate
+		scheduler). Return the percentiles of both, the candidate/baseline
+		ratios, both tests and whether the difference is significant.
+	"""
+	base = percentiles(baseline, qs)
+	cand = percentiles(candidate, qs)
+	u, p_mw = mann_whitney(baseline, candidate)
+	d, p_ks = ks_2samp(baseline, candidate)
+	return {'baseline': base, 'candidate': cand,
+			'ratio': dict((q, cand[q] / base[q] if base[q] else float('nan')) for q in qs),
+			'mann_whitney': (u, p_mw), 'ks': (d, p_ks),
+			'significant': min(p_mw, p_ks) < alpha}
+
+
+def _load(source, kind):
+	if os.path.isdir(source):
+		return collector.collect(source, kind)
+	return collector.load_npz(source)
+
+
+def _format_percentiles(p):
+	return '  '.join('p%s=%.4g' % (('%g' % q), p[q]) for q in sorted(p))
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="FCT/goodput percentiles, CDFs and run comparison")
+	parser.add_argument('kind', choices=sorted(collector.READERS))
+	parser.add_argument('source', help="result directory or collector NPZ")
+	parser.add_argument('candidate', nargs='?', help="second run to compare against source")
+	parser.add_argument('--threshold', type=float, default=None,
+						help="report the share of values above it (e.g. FCT > 1 s)")
+	parser.add_argument('--sketch', action='store_true',
+						help="summarize a directory with quantile sketches")
+	parser.add_argument('--alpha', type=float, default=0.01)
+	args = parser.parse_args(argv)
+
+	if args.sketch:
+		for scenario, sketch in sorted(sketch_directory(args.source, args.kind, args.alpha).items()):
+			print('%-8s n=%-8d %s' % (scenario or 'all', sketch.count,
+									  _format_percentiles(sketch.percentiles())))
+		return
+	base = _load(args.source, args.kind)
+	if args.candidate is None:
+		for scenario, entry in sorted(summarize(base, args.threshold).items()):
+			line = '%-8s n=%-8d mean=%.4g  %s' % (scenario or 'all', entry['count'], entry['mean'],
+												 _format_percentiles(entry['percentiles']))
+			if 'over' in entry:
+				line += '  over=%.2f%%' % (100 * entry['over'])
+			print(line)
+		return
+	result = compare(base['value'], _load(args.candidate, args.kind)['value'])
+	print('baseline   %s' % _format_percentiles(result['baseline']))
+	print('candidate  %s' % _format_percentiles(result['candidate']))
+	print('ratio      %s' % _format_percentiles(result['ratio']))
+	print('mann-whitney U=%.1f p=%.3g  ks D=%.3f p=%.3g  %s' % (
+		result['mann_whitney'] + result['ks'] +
+		('significant' if result['significant'] else 'not significant',)))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,148 @@
+"""
+Per-pair best path table kept alongside the bandwidth graph.
+For every (src, dst) the candidate k shortest paths are ranked by their
+bottleneck free bandwidth. When links change only the pairs whose
+candidates use one of them are re-ranked, so lookups never copy or walk
+the whole path dict.
+"""
+
+
+class BestPathTable(object):
+	"""
+		self.best_paths = {src:{dst:path,},}
+		self.capabilities = {src:{dst:bottleneck_bw,},}   # capped at default_bw
+		self.bottleneck = {(src,dst):(pre,curr),}
+		self.path_bw = {(src,dst):[bottleneck_bw of each candidate,],}
+		self.path_util = {(src,dst):[max link utilization of each candidate,],}
+		self.link_pairs = {(src_dpid,dst_dpid):set((src,dst),),}
+	"""
+
+	def __init__(self, default_bw=10000):
+		self.default_bw = default_bw
+		self.paths = None
+		self.version = None
+		self.best_paths = {}
+		self.capabilities = {}
+		self.bottleneck = {}
+		self.path_bw = {}
+		self.path_util = {}
+		self.link_pairs = {}
+		self.turn = {}              # {(src,dst):round-robin offset for ties,}
+
+	def is_current(self, paths, version):
+		return self.paths is paths and self.version == version
+
+	def rebuild(self, paths, graph, version=None):
+		"""
+			Index and rank every pair of paths = {src:{dst:[[path],],},}.
+		"""
+		self.paths = paths
+		self.version = version
+		self.best_paths = {}
+		self.capabilities = {}
+		self.bottleneck = {}
+		self.path_bw = {}
+		self.path_util = {}
+		self.link_pairs = {}
+		for src in paths:
+			for dst in paths[src]:
+				if src == dst:
+					self.best_paths.setdefault(src, {})[src] = [src]
+					self.capabilities.setdefault(src, {})[src] = self.default_bw
+					continue
+				for path in paths[src][dst] or []:
+					for link in zip(path[:-1], path[1:]):
+						self.link_pairs.setdefault(link, set()).add((src, dst))
+				self._rank(graph, src, dst)
+
+	def update_links(self, links, graph):
+		"""
+			Re-rank only the pairs whose candidate paths use one of links.
+			Return the re-ranked pairs.
+		"""
+		pairs = set()
+		for link in links:
+			pairs.update(self.link_pairs.get(link, ()))
+		for src, dst in pairs:
+			self._rank(graph, src, dst)
+		return pairs
+
+	def get(self, src, dst):
+		"""
+			Get (best_path, bottleneck_bw, bottleneck_link) of a pair, or None.
+		"""
+		path = self.best_paths.get(src, {}).get(dst)
+		if path is None:
+			return None
+		return path, self.capabilities[src][dst], self.bottleneck.get((src, dst))
+
+	def select(self, src, dst):
+		"""
+			Get (elephant_path, mice_path) of a pair in O(k), or None.
+			The elephant path is the candidate with the most bottleneck free
+			bandwidth, the mice path the least utilized of the others.
+			Ties rotate between calls so that a burst of new flows, arriving
+			before the next stats reply, is not stacked on one candidate.
+		"""
+		path_bw = self.path_bw.get((src, dst))
+		if not path_bw:
+			return None
+		candidates = self.paths[src][dst]
+		n = len(candidates)
+		turn = self.turn.get((src, dst), 0)
+		self.turn[(src, dst)] = turn + 1
+		order = [(turn + i) % n for i in xrange(n)]
+		ele = max(order, key=lambda i: path_bw[i])
+		others = [i for i in order if i != ele] or [ele]
+		path_util = self.path_util[(src, dst)]
+		mice = min(others, key=lambda i: path_util[i])
+		return candidates[ele], candidates[mice]
+
+	def _rank(self, graph, src, dst):
+		candidates = self.paths[src][dst]
+		if not candidates:
+			return
+		best_path = candidates[0]
+		max_bw = 0
+		best_link = None
+		path_bw = []
+		path_util = []
+		for path in candidates:
+			bw, link = self.bottleneck_of(graph, path)
+			path_bw.append(bw)
+			path_util.append(self.utilization_of(graph, path))
+			if bw > max_bw:
+				max_bw = bw
+				best_path = path
+				best_link = link
+		self.best_paths.setdefault(src, {})[dst] = best_path
+		self.capabilities.setdefault(src, {})[dst] = min(max_bw, self.default_bw)
+		self.bottleneck[(src, dst)] = best_link
+		self.path_bw[(src, dst)] = path_bw
+		self.path_util[(src, dst)] = path_util
+
+	def bottleneck_of(self, graph, path):
+		"""
+			Get (min free bandwidth, link) along path. Links without a
+			bandwidth attribute do not limit the path.
+		"""
+		min_bw = float('inf')
+		min_link = None
+		for link in zip(path[:-1], path[1:]):
+			attrs = graph[link[0]].get(link[1]) if link[0] in graph else None
+			if attrs and 'bandwidth' in attrs and attrs['bandwidth'] < min_bw:
+				min_bw = attrs['bandwidth']
+				min_link = link
+		return min_bw, min_link
+
+	def utilization_of(self, graph, path):
+		"""
+			Get the highest link utilization along path, the queueing
+			hot spot a mice flow would hit.
+		"""
+		util = 0
+		for link in zip(path[:-1], path[1:]):
+			attrs = graph[link[0]].get(link[1]) if link[0] in graph else None
+			if attrs:
+				util = max(util, attrs.get('utilization', 0))
+		return util
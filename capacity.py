@@ -0,0 +1,85 @@
+"""
+Link capacity model of the monitor.
+Port capacities come from the curr_speed/max_speed the switches report,
+and can be overridden by a JSON file that fattree.py writes from the
+bandwidth of its TCLinks, since emulated ports report the veth speed
+rather than the shaped one.
+"""
+import json
+import os
+
+
+def save_capacity_file(path, capacities):
+	"""
+		Write capacities = {dpid:{port_no:Kbit/s,},} as JSON.
+	"""
+	data = dict((str(dpid), dict((str(port_no), bw) for port_no, bw in ports.items()))
+				for dpid, ports in capacities.items())
+	tmp = path + '.tmp'
+	with open(tmp, 'w') as f:
+		json.dump(data, f, indent=1, sort_keys=True)
+	os.rename(tmp, path)
+
+
+class CapacityRegistry(object):
+	"""
+		self.overrides = {(dpid, port_no):capacity,}   from the capacity file
+		self.reported = {(dpid, port_no):capacity,}    from OFPPort curr_speed/max_speed
+		capacity unit: Kbit/s
+	"""
+
+	def __init__(self, path=None, default=20000):
+		self.path = path
+		self.default = default
+		self.mtime = None
+		self.overrides = {}
+		self.reported = {}
+
+	def refresh(self):
+		"""
+			(Re)load the capacity file if it appeared or changed.
+			Return True if it was loaded.
+		"""
+		if not self.path:
+			return False
+		try:
+			mtime = os.stat(self.path).st_mtime
+		except OSError:
+			return False
+		if mtime == self.mtime:
+			return False
+		with open(self.path) as f:
+			data = json.load(f)
+		self.overrides = dict(((int(dpid), int(port_no)), bw)
+							  for dpid, ports in data.items()
+							  for port_no, bw in ports.items())
+		self.mtime = mtime
+		return True
+
+	def update_port(self, dpid, port_no, curr_speed, max_speed=0):
+		speed = curr_speed or max_speed
+		if speed:
+			self.reported[(dpid, port_no)] = speed
+		else:
+			self.reported.pop((dpid, port_no), None)
+
+	def remove_port(self, dpid, port_no):
+		self.reported.pop((dpid, port_no), None)
+
+	def get(self, dpid, port_no):
+		"""
+			Get the capacity of a port: the capacity file first, then the
+			reported speed, then the default.
+		"""
+		key = (dpid, port_no)
+		bw = self.overrides.get(key)
+		if bw is None:
+			bw = self.reported.get(key, self.default)
+		return bw
+
+	def max_capacity(self):
+		"""
+			Get the largest capacity of any known port.
+		"""
+		return max([self.default] + list(self.overrides.values()) +
+				   list(self.reported.values()))
@@ -1,33 +1,21 @@
-import re
-import numpy as np
-import time
-import os
 from pyexcel_ods import save_data
 from collections import OrderedDict
+import analytics
+import collector
 
-data=OrderedDict()
-path="server_report"
-files=os.listdir(path)
-i=0
-s=[]
-for file in files:
-    f=open(path+"/"+file);
-    iter_f=iter(f);
-    put_list=[]
-    print("flie",file)
-    for line in iter_f:
-        put=re.findall(r".\s+\d+.  0.0-\d+.\d\s+sec\s+\d+.\d+\s+.Bytes\s+(.* \w)bits",line) 
-        if len(put)>0:
-            print('put=',put[0][:-2])
-            if "K" in put[0]:
-                a=put[0][:-2]
-                a=float(a)/1000
-            if "M" in put[0]:
-                a=put[0]=put[0][:-2]
-            #if float(a) < 200:
-            s.append(a)
-            #s.append(line)
-print(s)
-print(len(s))
-data.update({"Sheet 1": [s]})
-save_data("put.ods",data)
+if __name__ == '__main__':
+    path="server_report"
+    columns=collector.collect(path, 'goodput')
+    s=columns['value'].tolist()
+    print(s)
+    print(len(s))
+    for scenario, entry in sorted(analytics.summarize(columns).items()):
+        print("%s: %d flows, %s" % (scenario or 'all', entry['count'], entry['percentiles']))
+    collector.save_csv("put.csv", columns)
+    collector.save_npz("put.npz", columns)
+    intervals=collector.collect(path, 'intervals')
+    collector.save_csv("put_intervals.csv", intervals)
+    collector.save_npz("put_intervals.npz", intervals)
+    data=OrderedDict()
+    data.update({"Sheet 1": [s]})
+    save_data("put.ods",data)
@@ -0,0 +1,268 @@
+"""
+Result collector of the experiments.
+Report files are memory-mapped and scanned with precompiled regexes in a
+process pool, and the values are returned as columns (file, scenario,
+host, offset, value; conn, start, end for iperf intervals) with the
+metadata parsed from the file names:
+	mice_flow/mCT_h10_10.0         -> kind m, scenario CT, host 10, offset 10.0
+	server_report/server_report_h3 -> host 3
+Columns can be saved as CSV or NPZ.
+"""
+import argparse
+import csv
+import mmap
+import os
+import re
+from multiprocessing import Pool
+
+import numpy as np
+
+
+# wget: "--2022-08-12 16:47:12--  (try: 2)  http://..." starts a transfer or retry,
+# "     0K .......... .      100%  230K=0.05s", long ones "100%  108 =1m44s"
+# end an attempt; a retried attempt ends below 100%.
+FCT_PATTERN = re.compile(
+	br'^--\d{4}-\d\d-\d\d \d\d:\d\d:\d\d--\s+(\(try:)?'
+	br'|(\d+)%\s+\S+\s*=(?:(\d+)h)?(?:(\d+)m)?(?:([0-9.]+)s)?',
+	re.MULTILINE)
+
+# iperf/iperf3 report lines, TCP or UDP, client or server:
+#   "[  4] local 10.7.0.1 port 40000 connected with 10.1.0.1 port 51234"
+#   "[  3]  0.0-10.0 sec  11.9 MBytes  10.0 Mbits/sec"
+#   "[  3]  0.0-10.0 sec  1.25 MBytes  1.05 Mbits/sec   0.013 ms    0/  893 (0%)"
+#   "[  5]   0.00-10.00  sec  11.2 GBytes  9.62 Gbits/sec    0             sender"
+IPERF_PATTERN = re.compile(
+	br'^\[\s*(\d+)\]\s+(?:(local)\s[^\r\n]*connected[^\r\n]*'
+	br'|([0-9.]+)\s*-\s*([0-9.]+)\s+sec\s+[0-9.]+\s+\w?Bytes\s+([0-9.]+)\s+([KMGT]?)bits/sec(.*?))\r?$',
+	re.MULTILINE)
+
+# Decimal exponent of a rate unit in Mbit/s; iperf rates are decimal, and
+# parsing "950e-3" rounds once where 950 * 1e-3 would not.
+BITRATE_EXPONENT = {b'': b'e-6', b'K': b'e-3', b'M': b'', b'G': b'e3', b'T': b'e6'}
+
+FILE_PATTERNS = [
+	re.compile(r'^(?P<kind>[a-z]*)(?P<scenario>[A-Z][A-Za-z]*)_h(?P<host>\d+)_(?P<offset>[0-9.]+)$'),
+	re.compile(r'^server_report_h(?P<host>\d+)$'),
+]
+
+COLUMNS = ('file', 'kind', 'scenario', 'host', 'offset', 'value')
+
+INTERVAL_COLUMNS = ('file', 'kind', 'scenario', 'host', 'offset', 'conn', 'start', 'end', 'value')
+
+
+def parse_file_meta(name):
+	"""
+		Get {kind, scenario, host, offset} from a report file name;
+		unknown fields are '' / -1 / nan.
+	"""
+	meta = {'kind': '', 'scenario': '', 'host': -1, 'offset': float('nan')}
+	for pattern in FILE_PATTERNS:
+		m = pattern.match(name)
+		if m:
+			fields = m.groupdict()
+			meta['kind'] = fields.get('kind') or ''
+			meta['scenario'] = fields.get('scenario') or ''
+			meta['host'] = int(fields['host'])
+			if fields.get('offset'):
+				meta['offset'] = float(fields['offset'])
+			break
+	return meta
+
+
+def map_file(path):
+	"""
+		Get a read-only mmap of path, or b'' for an empty file.
+	"""
+	with open(path, 'rb') as f:
+		if os.fstat(f.fileno()).st_size == 0:
+			return b''
+		return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def read_fct(path):
+	"""
+		Get the flow completion times (s) of the wget transfers in a file.
+		The FCT of a transfer is the sum of its attempts; transfers that
+		never reach 100% are left out.
+	"""
+	data = map_file(path)
+	try:
+		values = []
+		total = None
+		for m in FCT_PATTERN.finditer(data):
+			retry, percent, hours, minutes, seconds = m.groups()
+			if percent is None:
+				if not retry:
+					total = None
+				continue
+			total = (total or 0.0) + (int(hours or 0) * 3600 + int(minutes or 0) * 60 +
+									  float(seconds or 0))
+			if percent == b'100':
+				values.append(total)
+				total = None
+		return values
+	finally:
+		if data:
+			data.close()
+
+
+def parse_iperf(data):
+	"""
+		Split an iperf/iperf3 report into per-connection records.
+		Return [[(start, end, Mbit/s, is_summary),],] in connection order;
+		iperf reuses the [id] of a closed connection, so connections are
+		told apart by their "connected" lines. A record starting at 0 is
+		the summary when it follows other records of its connection or
+		ends it; [SUM] lines of parallel streams are skipped.
+	"""
+	connections = []
+	current = {}        # {iperf id:index in connections,}
+	for m in IPERF_PATTERN.finditer(data):
+		conn_id = m.group(1)
+		if m.group(2) or conn_id not in current:
+			current[conn_id] = len(connections)
+			connections.append([])
+			if m.group(2):
+				continue
+		start, end = float(m.group(3)), float(m.group(4))
+		rate = float(m.group(5) + BITRATE_EXPONENT[m.group(6)])
+		if b'sender' in m.group(7):
+			# iperf3 prints the sender and the receiver side; keep the receiver.
+			continue
+		connections[current[conn_id]].append((start, end, rate))
+	result = []
+	for records in connections:
+		marked = []
+		for i, (start, end, rate) in enumerate(records):
+			summary = start == 0 and (i > 0 or i == len(records) - 1)
+			marked.append((start, end, rate, summary))
+		result.append(marked)
+	return result
+
+
+def read_goodput(path):
+	"""
+		Get the whole-connection goodputs (Mbit/s) of an iperf report,
+		the last summary of every connection (the server report of a UDP
+		client, the receiver of iperf3).
+	"""
+	data = map_file(path)
+	try:
+		values = []
+		for records in parse_iperf(data):
+			summaries = [rate for start, end, rate, summary in records if summary]
+			if summaries:
+				values.append(summaries[-1])
+		return values
+	finally:
+		if data:
+			data.close()
+
+
+def read_intervals(path):
+	"""
+		Get the per-interval throughput of an iperf report run with -i,
+		as [(connection number in the file, start, end, Mbit/s),].
+	"""
+	data = map_file(path)
+	try:
+		values = []
+		for conn, records in enumerate(parse_iperf(data)):
+			for start, end, rate, summary in records:
+				if not summary:
+					values.append((conn, start, end, rate))
+		return values
+	finally:
+		if data:
+			data.close()
+
+
+READERS = {'fct': read_fct, 'goodput': read_goodput, 'intervals': read_intervals}
+
+READER_COLUMNS = {'intervals': INTERVAL_COLUMNS}
+
+
+def _read_one(args):
+	kind, path = args
+	return os.path.basename(path), READERS[kind](path)
+
+
+def collect(directory, kind, processes=None, chunksize=32):
+	"""
+		Read every file of directory with READERS[kind] in a process pool.
+		Return {column:np.array,} sorted by file name, with the columns
+		of READER_COLUMNS[kind] (COLUMNS by default).
+	"""
+	names = sorted(os.listdir(directory))
+	jobs = [(kind, os.path.join(directory, name)) for name in names]
+	if processes == 1 or len(jobs) < 2:
+		results = [_read_one(job) for job in jobs]
+	else:
+		pool = Pool(processes)
+		try:
+			results = list(pool.imap(_read_one, jobs, chunksize))
+		finally:
+			pool.close()
+			pool.join()
+	return to_columns(results, READER_COLUMNS.get(kind, COLUMNS))
+
+
+def to_columns(results, names=COLUMNS):
+	"""
+		results = [(file name, [value,]),]
+		With INTERVAL_COLUMNS a value is (conn, start, end, value).
+	"""
+	columns = dict((name, []) for name in names)
+	fields = names[names.index('offset') + 1:]
+	for name, values in results:
+		meta = parse_file_meta(name)
+		for value in values:
+			columns['file'].append(name)
+			if len(fields) == 1:
+				value = (value,)
+			for key, field in zip(fields, value):
+				columns[key].append(field)
+			for key in ('kind', 'scenario', 'host', 'offset'):
+				columns[key].append(meta[key])
+	dtypes = {'file': str, 'kind': str, 'scenario': str, 'host': np.int64, 'conn': np.int64}
+	return dict((name, np.array(columns[name], dtype=dtypes.get(name, np.float64)))
+				for name in names)
+
+
+def save_csv(path, columns):
+	names = INTERVAL_COLUMNS if 'conn' in columns else COLUMNS
+	with open(path, 'w') as f:
+		writer = csv.writer(f)
+		writer.writerow(names)
+		for row in zip(*[columns[name].tolist() for name in names]):
+			writer.writerow(row)
+
+
+def save_npz(path, columns):
+	np.savez_compressed(path, **columns)
+
+
+def load_npz(path):
+	data = np.load(path)
+	return dict((name, data[name]) for name in data.files)
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Collect FCT, goodput or iperf interval results")
+	parser.add_argument('kind', choices=sorted(READERS))
+	parser.add_argument('directory')
+	parser.add_argument('--csv', help="write the columns as CSV")
+	parser.add_argument('--npz', help="write the columns as compressed NPZ")
+	parser.add_argument('--processes', type=int, default=None)
+	args = parser.parse_args(argv)
+	columns = collect(args.directory, args.kind, args.processes)
+	if args.csv:
+		save_csv(args.csv, columns)
+	if args.npz:
+		save_npz(args.npz, columns)
+	print("%d values from %d files" % (len(columns['value']), len(set(columns['file'].tolist()))))
+	return columns
+
+
+if __name__ == '__main__':
+	main()
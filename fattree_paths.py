@@ -0,0 +1,125 @@
+"""
+Closed-form path provider for the k-ary fat-tree built by fattree.Fattree.
+Switch dpids encode the layer (1xxx core, 2xxx aggregate, 3xxx edge), so the
+equal-cost edge->agg->core->agg->edge paths can be generated arithmetically
+instead of running Yen's algorithm for every pair.
+Only edge pairs and aggregate pairs of the same position have k equal-cost
+paths; every other pair involving an aggregate or core switch has fewer, so
+it needs Yen's longer paths and is still handed to the fallback.
+"""
+import math
+
+
+CORE, AGG, EDGE = 1, 2, 3
+
+
+class FattreePathProvider(object):
+	"""
+		Generate edge-to-edge (and same-position agg-to-agg) equal-cost
+		paths of a recognized fat-tree. Any other pair, or any topology that fails the structure check,
+		is handed to the fallback path function.
+	"""
+
+	def __init__(self, fallback):
+		# fallback(graph, src, dst, weight=weight, k=k) -> [[path],] or None
+		self.fallback = fallback
+		self.is_fattree = False
+		self.fanout = None
+		self.edge_pos = {}      # {edge_dpid:(pod, position),}
+		self.agg_pos = {}       # {agg_dpid:(pod, position),}
+		self.aggs = {}          # {pod:[agg_dpid,],}
+		self.cores = {}         # {position:[core_dpid,],}
+
+	def recognize(self, switches, link_to_port):
+		"""
+			Check that switches and link_to_port form a complete k-ary
+			fat-tree with the dpid scheme of fattree.Fattree.
+			Return True if the closed-form paths can be used.
+		"""
+		self.is_fattree = False
+		layers = {CORE: [], AGG: [], EDGE: []}
+		for dpid in switches:
+			layer = dpid // 1000
+			if layer not in layers:
+				return False
+			layers[layer].append(dpid)
+		n_edge = len(layers[EDGE])
+		fanout = int(round(math.sqrt(2 * n_edge)))
+		if fanout < 2 or fanout % 2 or fanout * fanout != 2 * n_edge:
+			return False
+		half = fanout // 2
+		cores = range(1001, 1001 + half * half)
+		aggs = range(2001, 2001 + n_edge)
+		edges = range(3001, 3001 + n_edge)
+		if (sorted(layers[CORE]) != list(cores) or
+				sorted(layers[AGG]) != list(aggs) or
+				sorted(layers[EDGE]) != list(edges)):
+			return False
+
+		expected = set()
+		for pod in xrange(fanout):
+			for i in xrange(half):
+				agg = aggs[pod * half + i]
+				for j in xrange(half):
+					expected.add((agg, edges[pod * half + j]))
+					expected.add((cores[i * half + j], agg))
+		expected |= set((dst, src) for (src, dst) in expected)
+		links = set(key for key in link_to_port if key[0] != key[1])
+		if links != expected:
+			return False
+
+		self.fanout = fanout
+		self.edge_pos = dict((edges[n], divmod(n, half)) for n in xrange(n_edge))
+		self.agg_pos = dict((aggs[n], divmod(n, half)) for n in xrange(n_edge))
+		self.aggs = dict((pod, list(aggs[pod * half:(pod + 1) * half]))
+						 for pod in xrange(fanout))
+		self.cores = dict((i, list(cores[i * half:(i + 1) * half]))
+						  for i in xrange(half))
+		self.is_fattree = True
+		return True
+
+	def k_shortest_paths(self, graph, src, dst, weight='weight', k=5):
+		"""
+			Same contract as NetworkAwareness.k_shortest_paths.
+			Equal-cost paths are only generated when there are at least
+			k of them, otherwise the longer paths Yen's algorithm would
+			add are needed and the fallback is used.
+		"""
+		paths = []
+		if self.is_fattree and src in self.edge_pos and dst in self.edge_pos:
+			paths = self.edge_paths(src, dst)
+		elif self.is_fattree and src in self.agg_pos and dst in self.agg_pos:
+			paths = self.agg_paths(src, dst)
+		if len(paths) >= k:
+			return paths[:k]
+		return self.fallback(graph, src, dst, weight=weight, k=k)
+
+	def edge_paths(self, src, dst):
+		"""
+			Enumerate all shortest paths between two edge switches.
+			The paths are interleaved across the aggregate switches, so
+			the first k spread over the uplinks instead of sharing one.
+		"""
+		src_pod = self.edge_pos[src][0]
+		dst_pod = self.edge_pos[dst][0]
+		if src_pod == dst_pod:
+			return [[src, agg, dst] for agg in self.aggs[src_pod]]
+		half = self.fanout // 2
+		paths = []
+		for j in xrange(half):
+			for i in xrange(half):
+				paths.append([src, self.aggs[src_pod][i], self.cores[i][j],
+							  self.aggs[dst_pod][i], dst])
+		return paths
+
+	def agg_paths(self, src, dst):
+		"""
+			Enumerate the agg->core->agg paths between two aggregate
+			switches of the same position in different pods; any other
+			aggregate pair gets none.
+		"""
+		src_pod, i = self.agg_pos[src]
+		dst_pod, j = self.agg_pos[dst]
+		if src_pod == dst_pod or i != j:
+			return []
+		return [[src, core, dst] for core in self.cores[i]]
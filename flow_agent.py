@@ -0,0 +1,138 @@
+"""
+Per-host flow agent of the scenarios.
+scenario.run stages the schedule of every host in a file and starts one
+agent in each host namespace:
+
+	python flow_agent.py --start T0 schedule.jsonl log.jsonl
+
+The agent launches every command at T0 + time on CLOCK_MONOTONIC, which
+all the Mininet namespaces share, and logs when each flow actually
+started and ended, so that the launch skew can be reported.
+	schedule line = {"time": s after T0, "command": shell command, "output": file}
+	log line = {"event": "start"|"end", "time", "output", "start"|"end", "skew"|"returncode"}
+"""
+import argparse
+import json
+import subprocess
+import threading
+import time
+
+try:
+	from time import monotonic
+except ImportError:
+	# Python 2: clock_gettime(CLOCK_MONOTONIC) from libc, time.time otherwise.
+	import ctypes
+	import ctypes.util
+
+	class _timespec(ctypes.Structure):
+		_fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+	try:
+		_clock_gettime = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6',
+									 use_errno=True).clock_gettime
+		_clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(_timespec)]
+	except (OSError, AttributeError):
+		_clock_gettime = None
+
+	def monotonic():
+		if _clock_gettime is None:
+			return time.time()
+		ts = _timespec()
+		_clock_gettime(1, ctypes.byref(ts))   # CLOCK_MONOTONIC
+		return ts.tv_sec + ts.tv_nsec * 1e-9
+
+
+SPIN = 0.002   # The last 2 ms before a launch are busy-waited.
+
+
+def save_schedule(path, entries):
+	"""
+		entries = [(time, command, output),]
+	"""
+	with open(path, 'w') as f:
+		for t, command, output in entries:
+			f.write(json.dumps({'time': t, 'command': command, 'output': output}) + '\n')
+
+
+def load_schedule(path):
+	with open(path) as f:
+		return sorted((json.loads(line) for line in f if line.strip()),
+					  key=lambda entry: entry['time'])
+
+
+def sleep_until(deadline):
+	while True:
+		left = deadline - monotonic()
+		if left <= 0:
+			return
+		if left > SPIN:
+			time.sleep(left - SPIN)
+
+
+def read_skews(paths):
+	"""
+		Get the launch skews (s) logged by the agents in paths.
+	"""
+	skews = []
+	for path in paths:
+		try:
+			with open(path) as f:
+				for line in f:
+					record = json.loads(line)
+					if record['event'] == 'start':
+						skews.append(record['skew'])
+		except (IOError, ValueError):
+			continue
+	return skews
+
+
+class FlowAgent(object):
+	"""
+		Launch the schedule of one host from T0 = start (monotonic).
+	"""
+
+	def __init__(self, schedule, start, log):
+		self.schedule = schedule
+		self.start = start
+		self.log = log
+		self.lock = threading.Lock()
+
+	def _record(self, record):
+		with self.lock:
+			self.log.write(json.dumps(record) + '\n')
+			self.log.flush()
+
+	def _wait(self, entry, proc):
+		returncode = proc.wait()
+		self._record({'event': 'end', 'time': entry['time'], 'output': entry['output'],
+					  'end': monotonic() - self.start, 'returncode': returncode})
+
+	def run(self):
+		waiters = []
+		for entry in self.schedule:
+			sleep_until(self.start + entry['time'])
+			proc = subprocess.Popen(entry['command'], shell=True)
+			started = monotonic() - self.start
+			self._record({'event': 'start', 'time': entry['time'], 'output': entry['output'],
+						  'start': started, 'skew': started - entry['time']})
+			waiter = threading.Thread(target=self._wait, args=(entry, proc))
+			waiter.daemon = True
+			waiter.start()
+			waiters.append(waiter)
+		for waiter in waiters:
+			waiter.join()
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Launch a host's flows on schedule")
+	parser.add_argument('--start', type=float, required=True,
+						help="T0 on the monotonic clock")
+	parser.add_argument('schedule')
+	parser.add_argument('log')
+	args = parser.parse_args(argv)
+	with open(args.log, 'w') as log:
+		FlowAgent(load_schedule(args.schedule), args.start, log).run()
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,145 @@
+"""
+Cookies and index of the flow entries installed by the controller.
+The class of an entry lives in the top byte of its cookie and a flow id
+in the rest, so one cookie/cookie_mask pair selects a class in stats
+requests and deletes, and the full cookie selects the entries of one
+flow. FlowRegistry keeps which switches and links every flow uses.
+"""
+
+COOKIE_CLASS_SHIFT = 56
+
+COOKIE_ELEPHANT = 0x10 << COOKIE_CLASS_SHIFT   # Exact 5-tuple entries installed by main.py
+
+COOKIE_MICE = 0x11 << COOKIE_CLASS_SHIFT   # tcp_dst 8000 entries installed by main.py
+
+COOKIE_RESCHEDULED = 0x12 << COOKIE_CLASS_SHIFT   # Elephant flows moved by network_monitor.py
+
+COOKIE_PROACTIVE = 0x20 << COOKIE_CLASS_SHIFT   # Table-miss and proactive fat-tree entries
+
+COOKIE_REACTIVE = 0x10 << COOKIE_CLASS_SHIFT   # With COOKIE_REACTIVE_MASK: every 0x1x class
+
+COOKIE_REACTIVE_MASK = 0xf0 << COOKIE_CLASS_SHIFT
+
+COOKIE_CLASS_MASK = 0xff << COOKIE_CLASS_SHIFT
+
+COOKIE_ID_MASK = (1 << COOKIE_CLASS_SHIFT) - 1
+
+COOKIE_FULL_MASK = (1 << 64) - 1
+
+
+def cookie_class(cookie):
+	return cookie & COOKIE_CLASS_MASK
+
+
+def is_reactive(cookie):
+	return cookie & COOKIE_REACTIVE_MASK == COOKIE_REACTIVE
+
+
+class FlowRegistry(object):
+	"""
+		self.flows = {cookie:(flow, path),}
+		self.entries = {cookie:{dpid:entry_key,},}
+		self.slots = {(dpid, entry_key):cookie,}   entry_key = (priority, match fields)
+		self.switch_flows = {dpid:set(cookie,),}
+		self.link_flows = {(src_dpid,dst_dpid):set(cookie,),}
+	"""
+
+	def __init__(self):
+		self.next_id = 0
+		self.flows = {}
+		self.entries = {}
+		self.slots = {}
+		self.switch_flows = {}
+		self.link_flows = {}
+
+	def new_cookie(self, cls):
+		"""
+			Allocate the cookie of a new flow of class cls.
+		"""
+		self.next_id = self.next_id % COOKIE_ID_MASK + 1
+		return cls | self.next_id
+
+	def register(self, cookie, path, mods, flow=None):
+		"""
+			Index the FlowMods (one per switch) installed for cookie along
+			path. An entry overwriting the same match and priority of an
+			older flow detaches it from that flow.
+		"""
+		self.flows[cookie] = (flow, tuple(path))
+		entries = self.entries.setdefault(cookie, {})
+		for mod in mods:
+			dpid = mod.datapath.id
+			entry_key = (mod.priority, tuple(mod.match.items()))
+			old = self.slots.get((dpid, entry_key))
+			if old is not None and old != cookie:
+				self.remove_entry(dpid, old)
+			self.slots[(dpid, entry_key)] = cookie
+			entries[dpid] = entry_key
+			self.switch_flows.setdefault(dpid, set()).add(cookie)
+		for link in zip(path[:-1], path[1:]):
+			self.link_flows.setdefault(link, set()).add(cookie)
+
+	def remove_entry(self, dpid, cookie):
+		"""
+			Forget the entry of cookie on dpid (OFPFlowRemoved), and the
+			flow itself once none of its entries is left.
+		"""
+		entries = self.entries.get(cookie)
+		if entries is None or dpid not in entries:
+			return
+		entry_key = entries.pop(dpid)
+		if self.slots.get((dpid, entry_key)) == cookie:
+			del self.slots[(dpid, entry_key)]
+		self.switch_flows[dpid].discard(cookie)
+		if not entries:
+			self.forget(cookie)
+
+	def remove_switch(self, dpid):
+		for cookie in list(self.switch_flows.get(dpid, ())):
+			self.remove_entry(dpid, cookie)
+		self.switch_flows.pop(dpid, None)
+
+	def forget(self, cookie):
+		"""
+			Drop a flow from every index. Return the dpids it still had
+			entries on.
+		"""
+		flow = self.flows.pop(cookie, None)
+		entries = self.entries.pop(cookie, {})
+		for dpid, entry_key in entries.items():
+			if self.slots.get((dpid, entry_key)) == cookie:
+				del self.slots[(dpid, entry_key)]
+			self.switch_flows[dpid].discard(cookie)
+		if flow:
+			path = flow[1]
+			for link in zip(path[:-1], path[1:]):
+				cookies = self.link_flows.get(link)
+				if cookies:
+					cookies.discard(cookie)
+					if not cookies:
+						del self.link_flows[link]
+		return list(entries)
+
+	def occupancy(self):
+		"""
+			Get {dpid:number of registered entries,} per switch.
+		"""
+		return dict((dpid, len(cookies)) for dpid, cookies in self.switch_flows.items())
+
+	def flows_on_link(self, link):
+		return set(self.link_flows.get(link, ()))
+
+	def flows_on_switch(self, dpid):
+		return set(self.switch_flows.get(dpid, ()))
+
+	def entries_of(self, cookie):
+		"""
+			Get {dpid:entry_key,} of a flow.
+		"""
+		return dict(self.entries.get(cookie, {}))
+
+	def flow_of(self, cookie):
+		"""
+			Get (flow, path) of a cookie, or None.
+		"""
+		return self.flows.get(cookie)
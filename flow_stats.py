@@ -0,0 +1,152 @@
+"""
+Flow-level statistics for NetworkMonitor.
+Byte/packet deltas and rates of every reactive flow are tracked across
+consecutive flow-stats replies in array-backed ring buffers, keyed by
+(dpid, 5-tuple). Entries not seen for a few poll intervals of their switch
+are evicted and their rows reused.
+"""
+import time
+
+import numpy as np
+
+
+def flow_key(match):
+	"""
+		Get the 5-tuple (ipv4_src, ipv4_dst, ip_proto, L4_sport, L4_dport)
+		of an OFPMatch.
+	"""
+	ip_proto = match.get('ip_proto')
+	if ip_proto == 17:
+		sport, dport = match.get('udp_src'), match.get('udp_dst')
+	else:
+		sport, dport = match.get('tcp_src'), match.get('tcp_dst')
+	return (match.get('ipv4_src'), match.get('ipv4_dst'), ip_proto, sport, dport)
+
+
+class FlowRateTable(object):
+	"""
+		self.rows = {(dpid, flow_key):row,}
+		self.rate: [row, sample] ring buffer, unit: byte/s
+		self.byte_count / packet_count / duration: last sample of each row
+		self.last_seen: wall time the row was last refreshed
+		self.dpid: switch of each row
+	"""
+
+	def __init__(self, depth=3, idle_periods=3, size=256):
+		self.depth = depth
+		self.idle_periods = idle_periods
+		self.rows = {}
+		self.keys = {}              # {row:(dpid, flow_key),}
+		self.free_rows = []
+		self.size = 0
+		self.count = np.zeros(size, dtype=np.int64)
+		self.byte_count = np.zeros(size, dtype=np.float64)
+		self.packet_count = np.zeros(size, dtype=np.float64)
+		self.duration = np.zeros(size, dtype=np.float64)
+		self.last_seen = np.zeros(size, dtype=np.float64)
+		self.dpid = np.zeros(size, dtype=np.int64)
+		self.rate = np.zeros((size, depth), dtype=np.float64)
+		self.pkt_rate = np.zeros((size, depth), dtype=np.float64)
+
+	def save_flow_stats(self, dpid, body, period, now=None):
+		"""
+			Save the IPv4 entries of one OFPFlowStatsReply body and evict
+			the rows of dpid not seen for idle_periods polls of period
+			seconds. Return the number of entries saved.
+		"""
+		now = time.time() if now is None else now
+		stats = [stat for stat in body if stat.match.get('ipv4_src')]
+		if stats:
+			rows = np.array([self._row_of((dpid, flow_key(stat.match))) for stat in stats],
+							dtype=np.int64)
+			byte_count = np.array([stat.byte_count for stat in stats], dtype=np.float64)
+			packet_count = np.array([stat.packet_count for stat in stats], dtype=np.float64)
+			duration = np.array([stat.duration_sec + stat.duration_nsec / 1000000000.0
+								 for stat in stats], dtype=np.float64)
+
+			# A re-installed entry restarts its counters, use it as a first sample.
+			has_prev = (self.count[rows] > 0) & (duration > self.duration[rows])
+			d_bytes = np.where(has_prev, byte_count - self.byte_count[rows], byte_count)
+			d_pkts = np.where(has_prev, packet_count - self.packet_count[rows], packet_count)
+			period = np.where(has_prev, duration - self.duration[rows], duration)
+			rate = np.zeros(len(rows))
+			pkt_rate = np.zeros(len(rows))
+			np.divide(d_bytes, period, out=rate, where=period > 0)
+			np.divide(d_pkts, period, out=pkt_rate, where=period > 0)
+
+			slot = self.count[rows] % self.depth
+			self.rate[rows, slot] = rate
+			self.pkt_rate[rows, slot] = pkt_rate
+			self.byte_count[rows] = byte_count
+			self.packet_count[rows] = packet_count
+			self.duration[rows] = duration
+			self.last_seen[rows] = now
+			self.count[rows] += 1
+		self.evict(dpid, self.idle_periods * period, now)
+		return len(stats)
+
+	def evict(self, dpid, idle_time, now=None):
+		"""
+			Free the rows of the flows of dpid not seen for idle_time seconds.
+			Other switches are polled at their own intervals and are left alone.
+		"""
+		now = time.time() if now is None else now
+		used = np.array(list(self.keys), dtype=np.int64)
+		if not len(used):
+			return
+		idle = (self.dpid[used] == dpid) & (now - self.last_seen[used] > idle_time)
+		for row in used[idle].tolist():
+			del self.rows[self.keys.pop(row)]
+			self.count[row] = 0
+			self.free_rows.append(row)
+
+	def get_rate(self, dpid, key):
+		"""
+			Get the latest rate (byte/s) of a flow, 0 if unknown.
+		"""
+		row = self.rows.get((dpid, key))
+		if row is None or not self.count[row]:
+			return 0
+		return self.rate[row, (self.count[row] - 1) % self.depth]
+
+	def is_elephant(self, dpid, key, threshold, sustain=2):
+		"""
+			A flow is an elephant if its last `sustain` rates are at least
+			threshold byte/s. The first sample of a row is only its
+			lifetime average, so it does not count: until `sustain`
+			rates between samples exist the flow is not an elephant.
+		"""
+		row = self.rows.get((dpid, key))
+		n = min(sustain, self.depth)
+		if row is None or self.count[row] <= n:
+			return False
+		slots = (self.count[row] - 1 - np.arange(n)) % self.depth
+		return bool((self.rate[row, slots] >= threshold).all())
+
+	def _row_of(self, key):
+		row = self.rows.get(key)
+		if row is None:
+			if self.free_rows:
+				row = self.free_rows.pop()
+			else:
+				row = self.size
+				if row == len(self.count):
+					self._grow()
+				self.size += 1
+			self.rows[key] = row
+			self.keys[row] = key
+			self.dpid[row] = key[0]
+		return row
+
+	def _grow(self):
+		size = len(self.count) * 2
+		for name in ('count', 'byte_count', 'packet_count', 'duration', 'last_seen', 'dpid'):
+			old = getattr(self, name)
+			new = np.zeros(size, dtype=old.dtype)
+			new[:len(old)] = old
+			setattr(self, name, new)
+		for name in ('rate', 'pkt_rate'):
+			old = getattr(self, name)
+			new = np.zeros((size, self.depth), dtype=old.dtype)
+			new[:len(old)] = old
+			setattr(self, name, new)
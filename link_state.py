@@ -0,0 +1,138 @@
+"""
+NumPy-backed link-state store for NetworkMonitor.
+Every (dpid, port_no) gets a stable row; tx/rx bytes, sample times and
+speeds are kept in per-row ring buffers so a whole port-stats reply is
+written, and its speeds computed, with one vectorized update.
+"""
+import numpy as np
+
+
+class LinkStateStore(object):
+	"""
+		self.rows = {(dpid, port_no):row,}
+		self.tx_bytes / rx_bytes / rx_errors / times / speed: [row, sample] ring buffers
+		self.capacity / free_bw: [row], unit: Kbit/s
+		speed unit: byte/s.
+	"""
+
+	def __init__(self, depth=5, size=64):
+		self.depth = depth
+		self.rows = {}
+		self.keys = []
+		self.count = np.zeros(size, dtype=np.int64)
+		self.tx_bytes = np.zeros((size, depth), dtype=np.float64)
+		self.rx_bytes = np.zeros((size, depth), dtype=np.float64)
+		self.rx_errors = np.zeros((size, depth), dtype=np.float64)
+		self.times = np.zeros((size, depth), dtype=np.float64)
+		self.speed = np.zeros((size, depth), dtype=np.float64)
+		self.capacity = np.zeros(size, dtype=np.float64)
+		self.free_bw = np.zeros(size, dtype=np.float64)
+
+	def row_of(self, dpid, port_no):
+		"""
+			Get the row of (dpid, port_no), allocating one on first sight.
+		"""
+		key = (dpid, port_no)
+		row = self.rows.get(key)
+		if row is None:
+			row = len(self.keys)
+			if row == len(self.count):
+				self._grow()
+			self.rows[key] = row
+			self.keys.append(key)
+		return row
+
+	def save_port_stats(self, dpid, stats, default_period):
+		"""
+			Save one OFPPortStatsReply body (without OFPP_LOCAL) and
+			return (port_nos, speeds) of the ports in it.
+			With a single sample the speed is tx_bytes / default_period.
+		"""
+		if not stats:
+			return np.zeros(0, dtype=np.int64), np.zeros(0)
+		port_nos = np.array([stat.port_no for stat in stats], dtype=np.int64)
+		rows = np.array([self.row_of(dpid, p) for p in port_nos], dtype=np.int64)
+		tx = np.array([stat.tx_bytes for stat in stats], dtype=np.float64)
+		rx = np.array([stat.rx_bytes for stat in stats], dtype=np.float64)
+		err = np.array([stat.rx_errors for stat in stats], dtype=np.float64)
+		now = np.array([stat.duration_sec + stat.duration_nsec / 1000000000.0
+						for stat in stats], dtype=np.float64)
+
+		slot = self.count[rows] % self.depth
+		prev = (self.count[rows] - 1) % self.depth
+		has_prev = self.count[rows] > 0
+		pre_tx = np.where(has_prev, self.tx_bytes[rows, prev], 0.0)
+		period = np.where(has_prev, now - self.times[rows, prev], default_period)
+		speed = np.zeros(len(rows))
+		np.divide(tx - pre_tx, period, out=speed, where=period != 0)
+
+		self.tx_bytes[rows, slot] = tx
+		self.rx_bytes[rows, slot] = rx
+		self.rx_errors[rows, slot] = err
+		self.times[rows, slot] = now
+		self.speed[rows, slot] = speed
+		self.count[rows] += 1
+		return port_nos, speed
+
+	def save_free_bw(self, dpid, port_nos, capacity):
+		"""
+			Compute and save free bandwidth (Kbit/s) of ports from their
+			latest speed and capacity (Kbit/s).
+		"""
+		rows = np.array([self.rows[(dpid, p)] for p in port_nos], dtype=np.int64)
+		self.capacity[rows] = capacity
+		used = self.latest_speed_rows(rows) * 8 / 1000.0
+		self.free_bw[rows] = np.maximum(self.capacity[rows] - used, 0)
+		return self.free_bw[rows]
+
+	def latest_speed_rows(self, rows):
+		return self.speed[rows, (self.count[rows] - 1) % self.depth]
+
+	def get_utilization(self, dpid, port_no):
+		"""
+			Get latest used / capacity of a port, 0 if unknown.
+		"""
+		row = self.rows.get((dpid, port_no))
+		if row is None or not self.count[row] or not self.capacity[row]:
+			return 0
+		used = self.speed[row, (self.count[row] - 1) % self.depth] * 8 / 1000.0
+		return float(used / self.capacity[row])
+
+	def get_speed(self, dpid, port_no):
+		"""
+			Get the latest speed (byte/s) of a port, 0 if never seen.
+		"""
+		row = self.rows.get((dpid, port_no))
+		if row is None or not self.count[row]:
+			return 0
+		return self.speed[row, (self.count[row] - 1) % self.depth]
+
+	def speeds(self):
+		"""
+			Get the latest speed (byte/s) of every row in one array.
+		"""
+		rows = np.arange(len(self.keys))
+		return np.where(self.count[rows] > 0, self.latest_speed_rows(rows), 0.0)
+
+	def utilization(self):
+		"""
+			Get used / capacity of every row; rows without capacity are 0.
+		"""
+		n = len(self.keys)
+		used = self.speeds() * 8 / 1000.0
+		util = np.zeros(n)
+		np.divide(used, self.capacity[:n], out=util, where=self.capacity[:n] > 0)
+		return util
+
+	def _grow(self):
+		size = len(self.count) * 2
+		for name in ('count', 'capacity', 'free_bw'):
+			old = getattr(self, name)
+			new = np.zeros(size, dtype=old.dtype)
+			new[:len(old)] = old
+			setattr(self, name, new)
+		for name in ('tx_bytes', 'rx_bytes', 'rx_errors', 'times', 'speed'):
+			old = getattr(self, name)
+			new = np.zeros((size, self.depth), dtype=old.dtype)
+			new[:len(old)] = old
+			setattr(self, name, new)
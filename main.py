@@ -22,17 +22,19 @@ from ryu.controller import ofp_event
 from ryu.controller.handler import MAIN_DISPATCHER, DEAD_DISPATCHER
 from ryu.controller.handler import set_ev_cls
 from ryu.ofproto import ofproto_v1_3
-from ryu.lib.packet import packet
-from ryu.lib.packet import ethernet
-from ryu.lib.packet import arp
-from ryu.lib.packet import ipv4
-from ryu.lib.packet import tcp
-from ryu.lib.packet import udp
+from ryu.lib.packet import ether_types
 
 import network_awareness
 import network_monitor
+import proactive_installer
+from packet_parser import decode_packet_in
+from path_installer import PathInstaller
+from flow_registry import COOKIE_ELEPHANT, COOKIE_MICE, is_reactive
+from telemetry import get_telemetry
+from packet_in_guard import PendingFlows, TokenBuckets
+from mice_aggregation import MiceAggregator, dst_prefix, MICE_DST_MASK
+from mice_aggregation import MICE_EXACT_PRIORITY, MICE_AGGREGATE_PRIORITY
 import setting
-import random
 
 #CONF = cfg.CONF
 
@@ -44,6 +46,8 @@ class ShortestForwarding(app_manager.RyuApp):
 	_CONTEXTS = {
 		"network_awareness": network_awareness.NetworkAwareness,
 		"network_monitor": network_monitor.NetworkMonitor}
+	if setting.CONTROLLER_PROACTIVE:
+		_CONTEXTS["proactive_installer"] = proactive_installer.ProactiveInstaller
 
 	WEIGHT_MODEL = {'hop': 'weight', 'bw': 'bw'}
 
@@ -55,6 +59,12 @@ class ShortestForwarding(app_manager.RyuApp):
 		self.datapaths = {}
 		self.weight = 'bw'
 		self.flwEntryCount = 0
+		self.telemetry = get_telemetry()
+		self.pending_flows = PendingFlows(setting.PENDING_FLOW_TTL)
+		self.packet_in_limiter = TokenBuckets(setting.PACKET_IN_RATE, setting.PACKET_IN_BURST)
+		self.mice_aggregator = MiceAggregator(self.monitor.flow_registry)
+		self.path_installer = PathInstaller(self.logger, setting.PATH_INSTALL_MODE,
+											telemetry=self.telemetry, name='forwarding.path_install')
 
 	@set_ev_cls(ofp_event.EventOFPStateChange, [MAIN_DISPATCHER, DEAD_DISPATCHER])
 	def _state_change_handler(self, ev):
@@ -70,6 +80,7 @@ class ShortestForwarding(app_manager.RyuApp):
 			if datapath.id in self.datapaths:
 				self.logger.debug('unregister datapath: %016x', datapath.id)
 				del self.datapaths[datapath.id]
+				self.mice_aggregator.remove_switch(datapath.id)
 
 	@set_ev_cls(ofp_event.EventOFPPacketIn, MAIN_DISPATCHER)
 	def _packet_in_handler(self, ev):
@@ -79,33 +90,41 @@ class ShortestForwarding(app_manager.RyuApp):
 			invoked to find the shortest paths
 		"""
 		msg = ev.msg
-		pkt = packet.Packet(msg.data)
-		arp_pkt = pkt.get_protocol(arp.arp)
-		ip_pkt = pkt.get_protocol(ipv4.ipv4)
+		if not self.packet_in_limiter.consume(msg.datapath.id):
+			self.telemetry.incr('forwarding.packet_in.dropped')
+			return
+		pkt = decode_packet_in(msg)
 		
-		if isinstance(arp_pkt, arp.arp):
+		if pkt.is_arp:
 			self.logger.debug("ARP processing")
-			self.arp_forwarding(msg, arp_pkt.src_ip, arp_pkt.dst_ip)
+			self.arp_forwarding(msg, pkt.arp_src_ip, pkt.arp_dst_ip)
 
-		if isinstance(ip_pkt, ipv4.ipv4):
-                        print('iperf packet-in')
+		if pkt.is_ipv4:
+			self.telemetry.incr('forwarding.packet_in.ipv4')
 			self.logger.debug("IPV4 processing")
-			if len(pkt.get_protocols(ethernet.ethernet)):
-				eth_type = pkt.get_protocols(ethernet.ethernet)[0].ethertype
-				self.shortest_forwarding(msg, eth_type, ip_pkt.src, ip_pkt.dst)
+			self.shortest_forwarding(msg, pkt.ethertype, pkt.ip_src, pkt.ip_dst)
 
-	def add_flow(self, dp, priority, match, actions, idle_timeout=0, hard_timeout=0):
+	def add_flow(self, dp, priority, match, actions, idle_timeout=0, hard_timeout=0, cookie=0):
 		"""
 			adding new flow entry to the switch indicated in dp by using OPF_Flow_MOD message
 		"""
+		dp.send_msg(self.build_flow_mod(dp, priority, match, actions,
+										idle_timeout, hard_timeout, cookie))
+
+	def build_flow_mod(self, dp, priority, match, actions, idle_timeout=0, hard_timeout=0, cookie=0):
+		"""
+			Build the OPF_Flow_MOD message of a new flow entry without sending it.
+		"""
 		ofproto = dp.ofproto
 		parser = dp.ofproto_parser
 		inst = [parser.OFPInstructionActions(ofproto.OFPIT_APPLY_ACTIONS, actions)]
-		mod = parser.OFPFlowMod(datapath=dp, priority=priority,
+		# Reactive entries report their removal to keep the flow registry in sync.
+		flags = ofproto.OFPFF_SEND_FLOW_REM if is_reactive(cookie) else 0
+		mod = parser.OFPFlowMod(datapath=dp, cookie=cookie, priority=priority,
 								idle_timeout=idle_timeout,
-								hard_timeout=hard_timeout,
+								hard_timeout=hard_timeout, flags=flags,
 								match=match, instructions=inst)
-		dp.send_msg(mod)
+		return mod
 
 	def _build_packet_out(self, datapath, buffer_id, src_port, dst_port, data):
 		"""
@@ -192,56 +211,25 @@ class ShortestForwarding(app_manager.RyuApp):
 			self.flood(msg)
 
 	def get_path(self, src, dst, weight):
-		
+		"""
+			Get the (elephant_path, mice_path) pair from src to dst.
+			With 'bw', elephant flows take the candidate with the most bottleneck
+			free bandwidth and mice flows the least utilized remaining candidate,
+			read in O(k) from the monitor's best path table.
+		"""
 		shortest_paths = self.awareness.shortest_paths
-		# Create bandwidth-sensitive datapath graph.
-		graph = self.awareness.graph
 
 		if weight == 'weight':
 			return shortest_paths.get(src).get(dst)[0],shortest_paths.get(src).get(dst)[1]
 		elif weight == 'bw':
-			# Because all paths will be calculated when we call self.monitor.get_best_path_by_bw,
-			# so we just need to call it once in a period, and then, we can get path directly.
-			# If path is existed just return it, else calculate and return it.
-			try:
-                            #path = self.monitor.best_paths.get(src).get(dst)
-                                r=random.randint(0,1)
-                                if r==0:
-                                        ele = shortest_paths.get(src).get(dst)[0]
-                                        mice = shortest_paths.get(src).get(dst)[1]
-                                        r=r+1
-                                if r==1:
-                                        ele = shortest_paths.get(src).get(dst)[2]
-                                        mice = shortest_paths.get(src).get(dst)[3]
-                                        r=r+1
-
-                                #return path
-                                return ele,mice
-			except:
-				result = self.monitor.get_best_path_by_bw(graph, shortest_paths)    #get_best_path_by_portbw(dpid,graph,path,speed)
-				paths = result[1]
-                                #print('result 0',result[0])    #result 0:bandwidth of link
-                                #print('result 1',len(result[1]))
-				best_path = paths.get(src).get(dst)
-                                
-                                #ele = shortest_paths.get(src).get(dst)[0]
-                                #mice = shortest_paths.get(src).get(dst)[1]
-                                r=random.randint(0,1)
-                                if r==0:
-                                        ele = shortest_paths.get(src).get(dst)[0]
-                                        mice = shortest_paths.get(src).get(dst)[1]
-                                        r=r+1
-                                if r==1:
-                                        ele = shortest_paths.get(src).get(dst)[2]
-                                        mice = shortest_paths.get(src).get(dst)[3]
-                                        r=r+1
-
-
-                                #return best_path
-                                return ele,mice
+			paths = self.monitor.select_paths(src, dst)
+			if paths:
+				return paths
+			# No bandwidth information has been collected yet.
+			return shortest_paths.get(src).get(dst)[0],shortest_paths.get(src).get(dst)[1]
 		else:
 			pass
-       
+
 	def get_sw(self, dpid, in_port, src, dst):
 		
 		src_sw = dpid
@@ -261,8 +249,10 @@ class ShortestForwarding(app_manager.RyuApp):
 		else:
 			return None
 
-	def send_flow_mod(self, datapath, flow_info, src_port, dst_port):
-		
+	def get_flow_mod(self, datapath, flow_info, src_port, dst_port, cookie):
+		"""
+			Build the flow-mod of flow_info for one hop of the path.
+		"""
 		parser = datapath.ofproto_parser
 		actions = []
 		actions.append(parser.OFPActionOutput(dst_port))
@@ -305,11 +295,11 @@ class ShortestForwarding(app_manager.RyuApp):
 			pass
 		#if we need to modify the timeout so we can do it here
                 if(flow_info[-1] == 8000):
-                        priority=50
+                        priority=MICE_EXACT_PRIORITY
                 else:
                         priority=30
-                self.add_flow(datapath, priority, match, actions,
-					  idle_timeout=1000, hard_timeout=0)
+                return self.build_flow_mod(datapath, priority, match, actions,
+					  idle_timeout=1000, hard_timeout=0, cookie=cookie)
 
 	def install_flow(self, datapaths, link_to_port, path, flow_info, buffer_id, data=None):
 		
@@ -322,34 +312,101 @@ class ShortestForwarding(app_manager.RyuApp):
 		first_dp = datapaths[path[0]]
 		# local virtual port on first switch
 		out_port = first_dp.ofproto.OFPP_LOCAL
-                if len(flow_info) == 9:
-			flow_key = (flow_info[1],flow_info[2],flow_info[6],flow_info[8])
+		if len(flow_info) == 9:
+			flow_key = (flow_info[1],flow_info[2],flow_info[4],flow_info[6],flow_info[8])
 		else:
-			flow_key = (flow_info[1],flow_info[2])
+			flow_key = (flow_info[1],flow_info[2],None,None,None)
 		# count the number of flows scheduled by this module
 		self.flwEntryCount += 1
-		# Install flow entry for intermediate datapaths.
-		for i in xrange(1, len(path) - 1):
-			port = self.get_port_pair_from_link(link_to_port, path[i-1], path[i])
-			port_next = self.get_port_pair_from_link(link_to_port, path[i], path[i+1])
-			if port and port_next:
-				src_port, dst_port = port[1], port_next[0]
-				datapath = datapaths[path[i]]
-				self.send_flow_mod(datapath, flow_info, src_port, dst_port)
-		#  Install flow entry for the first datapath.
+		#  Flow entry for the first datapath.
 		port_pair = self.get_port_pair_from_link(link_to_port, path[0], path[1])
 		if port_pair is None:
 			self.logger.info("Port not found in first hop.")
 			return
 		# the out port on the first datapath, this port will be used as outport in the action command
 		out_port = port_pair[0]
-		self.send_flow_mod(first_dp, flow_info, in_port, out_port)
-		# Send packet_out to the first datapath.
-		self.send_packet_out(first_dp, buffer_id, in_port, out_port, data)
+		hop_ports = [(first_dp, in_port, out_port)]
+		# Ports for intermediate datapaths.
+		for i in xrange(1, len(path) - 1):
+			port = self.get_port_pair_from_link(link_to_port, path[i-1], path[i])
+			port_next = self.get_port_pair_from_link(link_to_port, path[i], path[i+1])
+			if port and port_next:
+				hop_ports.append((datapaths[path[i]], port[1], port_next[0]))
+		registry = self.monitor.flow_registry
+		cookie = registry.new_cookie(COOKIE_MICE if flow_info[-1] == 8000 else COOKIE_ELEPHANT)
+		if self.is_mice_aggregable(path, flow_info):
+			hops = self.get_mice_hops(hop_ports, flow_info, cookie)
+		else:
+			hops = [(datapath, self.get_flow_mod(datapath, flow_info, src_port, dst_port, cookie))
+					for datapath, src_port, dst_port in hop_ports]
+		out_ports = dict((datapath.id, dst_port) for datapath, src_port, dst_port in hop_ports)
+		exact_mods = [mod for dp, mod in hops if mod.cookie == cookie]
+		if exact_mods:
+			registry.register(cookie, path, exact_mods, flow_key)
+		# Packet-ins of this flow until the entries land are only forwarded.
+		self.pending_flows.add(flow_key, out_ports)
+		# Install the path egress first, then release packet_out on the first datapath.
+		out = self._build_packet_out(first_dp, buffer_id, in_port, out_port, data)
+		self.path_installer.install(hops, (first_dp, out) if out else None, tuple(path))
+
+	def is_mice_aggregable(self, path, flow_info):
+		"""
+			Mice entries are aggregated only along minimum-hop paths, since
+			next hops taken from shortest paths to one destination never
+			form a loop.
+		"""
+		if not setting.MICE_AGGREGATION:
+			return False
+		if len(flow_info) != 9 or flow_info[4] != 6 or flow_info[-1] != 8000:
+			return False
+		shortest = self.awareness.shortest_paths.get(path[0], {}).get(path[-1])
+		return bool(shortest) and len(path) == len(shortest[0])
+
+	def get_mice_hops(self, hop_ports, flow_info, cookie):
+		"""
+			Build the hops of an aggregable mice flow: nothing where the
+			aggregate of the destination edge already forwards this way, a
+			new aggregate where there is none, and an exact entry where the
+			aggregate points elsewhere.
+			hop_ports = [(datapath, src_port, dst_port),]
+		"""
+		registry = self.monitor.flow_registry
+		prefix = dst_prefix(flow_info[2])
+		hops = []
+		for datapath, src_port, dst_port in hop_ports:
+			port = self.mice_aggregator.lookup(datapath.id, prefix)
+			if port == dst_port:
+				continue
+			if port is None:
+				agg_cookie = registry.new_cookie(COOKIE_MICE)
+				mod = self.get_mice_aggregate_mod(datapath, prefix, dst_port, agg_cookie)
+				registry.register(agg_cookie, [datapath.id], [mod], ('mice', prefix))
+				self.mice_aggregator.add(datapath.id, prefix, dst_port, agg_cookie)
+			else:
+				mod = self.get_flow_mod(datapath, flow_info, src_port, dst_port, cookie)
+			hops.append((datapath, mod))
+		return hops
 
-	def get_L4_info(self, tcp_pkt, udp_pkt):
+	def get_mice_aggregate_mod(self, datapath, prefix, dst_port, cookie):
 		"""
-			Using the APIs provided by RYU controller, we can get L4 
+			Build the flow-mod of the mice entry shared by every flow to
+			the destination edge subnet prefix.
+		"""
+		parser = datapath.ofproto_parser
+		actions = [parser.OFPActionOutput(dst_port)]
+		match = parser.OFPMatch(
+			eth_type=ether_types.ETH_TYPE_IP, ipv4_dst=(prefix, MICE_DST_MASK),
+			ip_proto=6, tcp_dst=8000)
+		return self.build_flow_mod(datapath, MICE_AGGREGATE_PRIORITY, match, actions,
+								   idle_timeout=1000, hard_timeout=0, cookie=cookie)
+
+	@set_ev_cls(ofp_event.EventOFPBarrierReply, MAIN_DISPATCHER)
+	def _barrier_reply_handler(self, ev):
+		self.path_installer.barrier_reply(ev.msg)
+
+	def get_L4_info(self, pkt):
+		"""
+			Using the decoded packet-in headers, we can get L4
 			information in case of TCP and UDP flows to be used for
 			the remaining functions.
 		"""
@@ -358,23 +415,13 @@ class ShortestForwarding(app_manager.RyuApp):
 		sFlag = None
 		L4_dport = None
 		dFlag = None
-		if tcp_pkt:
-			ip_proto = 6
-			if tcp_pkt.src_port:
-				L4_sport = tcp_pkt.src_port
+		if pkt.is_tcp or pkt.is_udp:
+			ip_proto = pkt.ip_proto
+			if pkt.src_port:
+				L4_sport = pkt.src_port
 				sFlag = 'src'
-			if tcp_pkt.dst_port:
-				L4_dport = tcp_pkt.dst_port
-				dFlag = 'dst'
-			else:
-				pass
-		elif udp_pkt:
-			ip_proto = 17
-			if udp_pkt.src_port:
-				L4_sport = udp_pkt.src_port
-				sFlag = 'src'
-			if udp_pkt.dst_port:
-				L4_dport = udp_pkt.dst_port
+			if pkt.dst_port:
+				L4_dport = pkt.dst_port
 				dFlag = 'dst'
 			else:
 				pass
@@ -390,14 +437,22 @@ class ShortestForwarding(app_manager.RyuApp):
 		"""
 		datapath = msg.datapath
 		in_port = msg.match['in_port']
-		pkt = packet.Packet(msg.data)
-		tcp_pkt = pkt.get_protocol(tcp.tcp)
-		udp_pkt = pkt.get_protocol(udp.udp)
+		pkt = decode_packet_in(msg)
 		ip_proto = None
 		L4_port = None
 		Flag = None
 		# Get ip_proto and L4 port number.
-		ip_proto, L4_sport, sFlag, L4_dport, dFlag = self.get_L4_info(tcp_pkt, udp_pkt)
+		ip_proto, L4_sport, sFlag, L4_dport, dFlag = self.get_L4_info(pkt)
+		if ip_proto and dFlag and sFlag:
+			flow_key = (ip_src, ip_dst, ip_proto, L4_sport, L4_dport)
+		else:
+			flow_key = (ip_src, ip_dst, None, None, None)
+		out_port = self.pending_flows.get_port(flow_key, datapath.id)
+		if out_port:
+			# The path of this flow is being installed, only forward the packet.
+			self.telemetry.incr('forwarding.packet_in.pending')
+			self.send_packet_out(datapath, msg.buffer_id, in_port, out_port, msg.data)
+			return
 		result = self.get_sw(datapath.id, in_port, ip_src, ip_dst)   # result = (src_sw, dst_sw)
 		if result:
 			src_sw, dst_sw = result[0], result[1]
@@ -0,0 +1,52 @@
+"""
+Wildcard aggregation of mice-class entries.
+Instead of one exact entry per (src, dst, tcp_dst=8000) on every hop, the
+hops of a mice path share one entry per destination edge switch, matching
+the edge's /16 subnet. A switch whose entry for that subnet already points
+elsewhere keeps an exact entry for the flow (priority MICE_EXACT_PRIORITY)
+on top of it. Hosts are 10.<edge>.0.<n>, so pods, whose edges are not
+CIDR-aligned, cannot be aggregated further.
+"""
+
+MICE_EXACT_PRIORITY = 50
+
+MICE_AGGREGATE_PRIORITY = 49
+
+MICE_DST_MASK = '255.255.0.0'
+
+
+def dst_prefix(ip_dst):
+	"""
+		Get the /16 subnet of the destination edge switch of ip_dst.
+	"""
+	return '.'.join(ip_dst.split('.')[:2]) + '.0.0'
+
+
+class MiceAggregator(object):
+	"""
+		self.rules = {dpid:{prefix:(out_port, cookie),},}
+		Every aggregate entry is registered in the FlowRegistry under its
+		own cookie, so a rule whose entry was removed is dropped lazily.
+	"""
+
+	def __init__(self, registry):
+		self.registry = registry
+		self.rules = {}
+
+	def lookup(self, dpid, prefix):
+		"""
+			Get the out port of the aggregate entry of prefix on dpid, or None.
+		"""
+		rule = self.rules.get(dpid, {}).get(prefix)
+		if rule is None:
+			return None
+		if dpid not in self.registry.entries.get(rule[1], ()):
+			del self.rules[dpid][prefix]
+			return None
+		return rule[0]
+
+	def add(self, dpid, prefix, out_port, cookie):
+		self.rules.setdefault(dpid, {})[prefix] = (out_port, cookie)
+
+	def remove_switch(self, dpid):
+		self.rules.pop(dpid, None)
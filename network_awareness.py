@@ -31,15 +31,16 @@ from ryu.controller.handler import MAIN_DISPATCHER
 from ryu.controller.handler import CONFIG_DISPATCHER
 from ryu.controller.handler import set_ev_cls
 from ryu.ofproto import ofproto_v1_3
-from ryu.lib.packet import packet
-from ryu.lib.packet import ethernet
-from ryu.lib.packet import ipv4
-from ryu.lib.packet import arp
 from ryu.lib import hub
 from ryu.topology import event
 from ryu.topology.api import get_switch, get_link
 
 import setting
+from path_cache import PathCache
+from fattree_paths import FattreePathProvider
+from packet_parser import decode_packet_in
+from flow_registry import COOKIE_PROACTIVE
+from telemetry import get_telemetry, LEVEL_SUMMARY
 
 
 CONF = cfg.CONF
@@ -64,7 +65,10 @@ class NetworkAwareness(app_manager.RyuApp):
 		super(NetworkAwareness, self).__init__(*args, **kwargs)
 		self.topology_api_app = self
 		self.name = "awareness"
+		self.telemetry = get_telemetry()
 		self.link_to_port = {}                 # {(src_dpid,dst_dpid):(src_port,dst_port),}
+		self.host_ip_index = {}                # {ip:(sw,port),}
+		self.host_mac_index = {}               # {mac:(sw,port),}
 		self.access_table = self.create_access_table(4)                # {(sw,port):(ip, mac),}
 		self.switch_port_table = {}      # {dpid:set(port_num,),}
 		self.access_ports = {}                # {dpid:set(port_num,),}
@@ -73,10 +77,19 @@ class NetworkAwareness(app_manager.RyuApp):
 		self.shortest_paths = {}            # {dpid:{dpid:[[path],],},}
 		self.pre_link_to_port = {}
 		self.pre_access_table = {}
+		self.topology_version = 0          # Bumped when the switches or links change.
+		self.topology_key = None
 
 		# Directed graph can record the loading condition of links more accurately.
 		# self.graph = nx.Graph()
 		self.graph = nx.DiGraph()
+		# Only pairs touched by a topology change are recomputed.
+		if setting.PATH_PROVIDER == 'fattree':
+			self.path_provider = FattreePathProvider(self.k_shortest_paths)
+			self.path_cache = PathCache(self.path_provider.k_shortest_paths, k=4)
+		else:
+			self.path_provider = None
+			self.path_cache = PathCache(self.k_shortest_paths, k=4)
 		# Get initiation delay.
 		self.initiation_delay = self.get_initiation_delay(4)
 		self.start_time = time.time()
@@ -94,12 +107,12 @@ class NetworkAwareness(app_manager.RyuApp):
 			hub.sleep(setting.DISCOVERY_PERIOD)
 			i = i + 1
 
-	def add_flow(self, dp, priority, match, actions, idle_timeout=0, hard_timeout=0):
+	def add_flow(self, dp, priority, match, actions, idle_timeout=0, hard_timeout=0, cookie=0):
 		ofproto = dp.ofproto
 		parser = dp.ofproto_parser
 		inst = [parser.OFPInstructionActions(ofproto.OFPIT_APPLY_ACTIONS,
 											 actions)]
-		mod = parser.OFPFlowMod(datapath=dp, priority=priority,
+		mod = parser.OFPFlowMod(datapath=dp, cookie=cookie, priority=priority,
 								idle_timeout=idle_timeout,
 								hard_timeout=hard_timeout,
 								match=match, instructions=inst)
@@ -119,7 +132,7 @@ class NetworkAwareness(app_manager.RyuApp):
 		match = parser.OFPMatch()
 		actions = [parser.OFPActionOutput(ofproto.OFPP_CONTROLLER,
 										  ofproto.OFPCML_NO_BUFFER)]
-		self.add_flow(datapath, 0, match, actions)
+		self.add_flow(datapath, 0, match, actions, cookie=COOKIE_PROACTIVE)
 
 	@set_ev_cls(ofp_event.EventOFPPacketIn, MAIN_DISPATCHER)
 	def _packet_in_handler(self, ev):
@@ -129,21 +142,18 @@ class NetworkAwareness(app_manager.RyuApp):
 		msg = ev.msg
 		datapath = msg.datapath
 		in_port = msg.match['in_port']
-		pkt = packet.Packet(msg.data)
-		arp_pkt = pkt.get_protocol(arp.arp)
-		ip_pkt = pkt.get_protocol(ipv4.ipv4)
-
-		if arp_pkt:
-                        print('arp packet')
-			arp_src_ip = arp_pkt.src_ip
-			mac = arp_pkt.src_mac
+		pkt = decode_packet_in(msg)
+
+		if pkt.is_arp:
+			self.telemetry.incr('awareness.packet_in.arp')
+			arp_src_ip = pkt.arp_src_ip
+			mac = pkt.arp_src_mac
 			# Record the access infomation.
 			self.register_access_info(datapath.id, in_port, arp_src_ip, mac)
-		elif ip_pkt:
-                        print('ip packet')
-			ip_src_ip = ip_pkt.src
-			eth = pkt.get_protocols(ethernet.ethernet)[0]
-			mac = eth.src
+		elif pkt.is_ipv4:
+			self.telemetry.incr('awareness.packet_in.ipv4')
+			ip_src_ip = pkt.ip_src
+			mac = pkt.eth_src
 			# Record the access infomation.
 			self.register_access_info(datapath.id, in_port, ip_src_ip, mac)
 		else:
@@ -162,6 +172,8 @@ class NetworkAwareness(app_manager.RyuApp):
                 #print("awareness get network topology")
 
 		#self.logger.info("[GET NETWORK TOPOLOGY]")
+		if isinstance(ev, event.EventLinkDelete):
+			self.remove_interior_link(ev.link)
 		switch_list = get_switch(self.topology_api_app, None)
                 sw_dpid=[s.dp.id for s in switch_list]
 		self.create_port_map(switch_list)
@@ -170,19 +182,33 @@ class NetworkAwareness(app_manager.RyuApp):
 		self.create_interior_links(links)
 		self.create_access_ports()
 		self.graph = self.get_graph(self.link_to_port.keys())
-		self.shortest_paths = self.all_k_shortest_paths(
-			self.graph, weight='weight', k=4)
+		topology_key = (frozenset(self.switches), frozenset(self.link_to_port.items()))
+		if topology_key != self.topology_key:
+			self.topology_key = topology_key
+			self.topology_version += 1
+		if self.path_provider:
+			self.path_provider.recognize(self.switches, self.link_to_port)
+		self.shortest_paths = self.path_cache.update(self.graph)
 
 	def get_host_location(self, host_ip):
 		"""
 			Get host location info ((datapath, port)) according to the host ip.
-			self.access_table = {(sw,port):(ip, mac),}
+			self.host_ip_index = {ip:(sw,port),}
+		"""
+		location = self.host_ip_index.get(host_ip)
+		if location is None:
+			self.logger.info("%s location is not found." % host_ip)
+		return location
+
+	def get_host_location_by_mac(self, host_mac):
+		"""
+			Get host location info ((datapath, port)) according to the host mac.
+			self.host_mac_index = {mac:(sw,port),}
 		"""
-		for key in self.access_table.keys():
-			if self.access_table[key][0] == host_ip:
-				return key
-		self.logger.info("%s location is not found." % host_ip)
-		return None
+		location = self.host_mac_index.get(host_mac)
+		if location is None:
+			self.logger.info("%s location is not found." % host_mac)
+		return location
 
 	def get_graph(self, link_list):
 		"""
@@ -242,6 +268,16 @@ class NetworkAwareness(app_manager.RyuApp):
 			if link.dst.dpid in self.switches:
 				self.interior_ports[link.dst.dpid].add(link.dst.port_no)
 
+	def remove_interior_link(self, link):
+		"""
+			Forget a deleted link so that the path cache invalidates
+			the pairs crossing it.
+		"""
+		key = (link.src.dpid, link.dst.dpid)
+		self.link_to_port.pop(key, None)
+		if self.graph.has_edge(*key):
+			self.graph.remove_edge(*key)
+
 	def create_access_ports(self):
 		"""
 			Get ports without link into access_ports.
@@ -268,6 +304,10 @@ class NetworkAwareness(app_manager.RyuApp):
 				k += 1
 				if k == fanout / 2 + 1:
 					k = 1
+		self.host_ip_index = {}
+		self.host_mac_index = {}
+		for key in table:
+			self._index_access_info(key, table[key])
 		return table
 
 	def k_shortest_paths(self, graph, src, dst, weight='weight', k=5):
@@ -316,15 +356,36 @@ class NetworkAwareness(app_manager.RyuApp):
 				if self.access_table[(dpid, in_port)] == (ip, mac):
 					return
 				else:
+					self._unindex_access_info((dpid, in_port))
 					self.access_table[(dpid, in_port)] = (ip, mac)
+					self._index_access_info((dpid, in_port), (ip, mac))
 					return
 			else:
 				self.access_table.setdefault((dpid, in_port), None)
 				self.access_table[(dpid, in_port)] = (ip, mac)
+				self._index_access_info((dpid, in_port), (ip, mac))
 				return
 
+	def _index_access_info(self, location, host):
+		"""
+			Point the ip and mac of host at location (sw, port).
+		"""
+		ip, mac = host
+		self.host_ip_index[ip] = location
+		self.host_mac_index[mac] = location
+
+	def _unindex_access_info(self, location):
+		"""
+			Drop the index entries of the host recorded at location.
+		"""
+		ip, mac = self.access_table[location]
+		if self.host_ip_index.get(ip) == location:
+			del self.host_ip_index[ip]
+		if self.host_mac_index.get(mac) == location:
+			del self.host_mac_index[mac]
+
 	def show_topology(self):
-		if self.pre_link_to_port != self.link_to_port and setting.TOSHOW:
+		if self.pre_link_to_port != self.link_to_port and setting.TOSHOW >= LEVEL_SUMMARY:
 			# It means the link_to_port table has changed.
 			_graph = self.graph.copy()
 			print "\n---------------------Link Port---------------------"
@@ -344,7 +405,7 @@ class NetworkAwareness(app_manager.RyuApp):
 			print
 			self.pre_link_to_port = self.link_to_port.copy()
 
-		if self.pre_access_table != self.access_table and setting.TOSHOW:
+		if self.pre_access_table != self.access_table and setting.TOSHOW >= LEVEL_SUMMARY:
 			# It means the access_table has changed.
 			print "\n----------------Access Host-------------------"
 			print '%10s' % 'switch', '%10s' % 'port', '%22s' % 'Host'
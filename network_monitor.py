@@ -20,7 +20,6 @@ elephant (large) flow reseduling, detection and port monitoring
 """
 
 from __future__ import division
-import copy
 from operator import attrgetter
 
 from ryu import cfg
@@ -31,12 +30,29 @@ from ryu.controller.handler import MAIN_DISPATCHER, DEAD_DISPATCHER
 from ryu.controller.handler import set_ev_cls
 from ryu.ofproto import ofproto_v1_3
 from ryu.lib import hub
-import logging
 import setting
 import time
+from path_installer import PathInstaller
+from link_state import LinkStateStore
+from best_path_table import BestPathTable
+from flow_stats import FlowRateTable, flow_key
+from capacity import CapacityRegistry
+from telemetry import get_telemetry, LEVEL_SUMMARY
+from flow_registry import FlowRegistry, cookie_class, is_reactive
+from flow_registry import COOKIE_REACTIVE, COOKIE_REACTIVE_MASK, COOKIE_MICE
+from flow_registry import COOKIE_RESCHEDULED, COOKIE_FULL_MASK
 
 CONF = cfg.CONF
 
+PORT_CONFIG = {ofproto_v1_3.OFPPC_PORT_DOWN: "Down",
+			   ofproto_v1_3.OFPPC_NO_RECV: "No Recv",
+			   ofproto_v1_3.OFPPC_NO_FWD: "No Farward",
+			   ofproto_v1_3.OFPPC_NO_PACKET_IN: "No Packet-in"}
+
+PORT_STATE = {ofproto_v1_3.OFPPS_LINK_DOWN: "Down",
+			  ofproto_v1_3.OFPPS_BLOCKED: "Blocked",
+			  ofproto_v1_3.OFPPS_LIVE: "Live"}
+
 class NetworkMonitor(app_manager.RyuApp):
 	"""
 		NetworkMonitor is the class responsible for collecting traffic metrics and rescheduling elephant flows.
@@ -47,23 +63,30 @@ class NetworkMonitor(app_manager.RyuApp):
 		super(NetworkMonitor, self).__init__(*args, **kwargs)
 		self.name = 'monitor'
 		self.datapaths = {}
-		self.port_speed = {}
-		self.flow_speed = {}
-                self.port_stats = {}
-		self.stats = {}
-		self.port_features = {}
+		# per-flow rates (byte/s), keyed by (dpid, 5-tuple)
+		self.flow_speed = FlowRateTable(depth=3, idle_periods=setting.FLOW_IDLE_PERIODS)
+		self.elephant_rate = setting.ELEPHANT_RATE * 1000 / 8.0   # byte/s
+		self.link_state = LinkStateStore(depth=5)   # port counters, speeds and free bandwidth
+		self.stats = {'flow': {}, 'port': {}}
+		self.poll_interval = {}   # {dpid:seconds between port-stats requests,}
+		self.next_poll = {}       # {dpid:time of the next port-stats request,}
+		self.port_features = {}   # {dpid:{port_no:(config, state, curr_speed),},} from PortDesc and PortStatus
 		self.free_bandwidth = {}   # self.free_bandwidth = {dpid:{port_no:free_bw,},} unit:Kbit/s
 		self.awareness = lookup_service_brick('awareness')
 		self.graph = None
 		self.capabilities = None
 		self.best_paths = None
+		self.best_path_table = BestPathTable()
 		self.edgdps = [3001,3002,3003,3004,3005,3006,3007,3008]
 		self.aggdps = [2001,2002,2003,2004,2005,2006,2007,2008]
 		self.cordps = [1001,1002,1003,1004]
 		self.sw_out_inf = {}
+		self.flow_stats_pending = {}   # {(dpid,port_no):(xid, send_time),}
+		self.flow_stats_xids = {}      # {xid:(dpid,port_no),}
+		self.flow_stats_parts = {}     # {xid:[OFPFlowStats,],} until the last multipart reply
 		self.redir_flowcounter = 100
 		self.redir_flow_num = 0
-		self.port_capacity = {3:{1:20000, 2:20000, 3:10000, 4:10000}, 2:{1:100000, 2:100000, 3:20000, 4:20000}}
+		self.capacity = CapacityRegistry(setting.CAPACITY_FILE, setting.DEFAULT_PORT_CAPACITY)
 		self.path = None
 		self.flow_info = None
 		self.path_redir_flows = None
@@ -71,41 +94,109 @@ class NetworkMonitor(app_manager.RyuApp):
 		self.failCount = 0
 		self.totalCount = 0
 		self.flwEntryCount = 0
+		self.telemetry = get_telemetry()
+		self.path_installer = PathInstaller(self.logger, setting.PATH_INSTALL_MODE,
+											telemetry=self.telemetry, name='monitor.path_install')
+		self.flow_registry = FlowRegistry()   # cookies, switches and links of reactive flows
                 self.r_times=[]
 		# Start green thread to monitor traffic and calculating
 		# free bandwidth of links, respectively.
 		self.monitor_thread = hub.spawn(self._monitor)
-		self.save_freebandwidth_thread = hub.spawn(self._save_bw_graph)
+		# The bandwidth graph is updated from _port_stats_reply_handler.
+		self.port_links = {}        # {(dpid,port_no):[(src_dpid,dst_dpid),],}
+		self.bw_graph_version = None    # awareness.topology_version of self.port_links
                 self.s=time.time()
 
 	def _monitor(self):
 		"""
-			Send requests for collecting network statistics
-		"""
-	#	while CONF.weight == 'bw':
-                while True:
-                #self.sw_out_inf = {}
-                    #print("_monitor")
-	    	    self.stats['flow'] = {}
-	    	    self.stats['port'] = {}
-		    for dp in self.datapaths.values():
-		        self.port_features.setdefault(dp.id, {})
-	    	        self._request_stats(dp)
-    		        # Refresh data.				
-                        self.capabilities = None
-		        self.best_paths = None
-                    print('r times',sum(self.r_times))
-		    hub.sleep(setting.MONITOR_PERIOD)
-	def _save_bw_graph(self):
-		"""
-			Save BW values into networkx graph.
-		"""
-	#	while CONF.weight == 'bw':
-                while True:
-		    self.graph = self.create_bw_graph(self.free_bandwidth)
-		    self.logger.debug("save free bandwidth")
-                    #print('flow sleep ',setting.MONITOR_PERIOD)
-		    hub.sleep(setting.MONITOR_PERIOD)
+			Send port-stats requests to every datapath whose polling
+			interval has elapsed. Intervals are kept per switch, see
+			_update_poll_interval.
+		"""
+		while True:
+			self.capacity.refresh()
+			now = time.time()
+			sent = False
+			for dp in self.datapaths.values():
+				if self.next_poll.get(dp.id, 0) <= now:
+					self.next_poll[dp.id] = now + self.poll_interval.get(dp.id, setting.MONITOR_PERIOD)
+					self._request_stats(dp)
+					sent = True
+			if sent:
+				self.telemetry.gauge('monitor.redirect_rounds', sum(self.r_times))
+				for dpid, entries in self.flow_registry.occupancy().items():
+					self.telemetry.gauge('flow_table.%d' % dpid, entries)
+			hub.sleep(setting.MONITOR_TICK)
+
+	def _schedule_datapath(self, dpid):
+		"""
+			Give a new datapath the default interval and a first poll
+			offset by the golden ratio from the others, so that polls (and
+			replies) stay spread over the period as switches connect.
+		"""
+		self.poll_interval[dpid] = setting.MONITOR_PERIOD
+		phase = (len(self.next_poll) * 0.618) % 1
+		self.next_poll[dpid] = time.time() + phase * setting.MONITOR_PERIOD
+
+	def _update_poll_interval(self, dpid, port_nos):
+		"""
+			Poll a switch more often the more loaded its busiest port is:
+			10 ** ((0.25 - load) / 0.25) seconds, clamped to
+			[MONITOR_MIN_PERIOD, MONITOR_MAX_PERIOD].
+		"""
+		load = max([self.link_state.get_utilization(dpid, port_no) for port_no in port_nos] or [0])
+		interval = 10 ** ((0.25 - load) / 0.25)
+		self.poll_interval[dpid] = min(max(interval, setting.MONITOR_MIN_PERIOD),
+									   setting.MONITOR_MAX_PERIOD)
+
+	def update_bw_graph(self, dpid, port_nos):
+		"""
+			Save BW values of the links touching port_nos of dpid into
+			networkx graph. Only these links changed since the last reply,
+			the whole graph is rebuilt when the topology version changed.
+			A new graph of an unchanged topology is a copy of the last one
+			(NetworkAwareness.get_graph), so it keeps the saved BW values.
+			Return the set of updated links.
+		"""
+		if self.awareness is None:
+			self.awareness = lookup_service_brick('awareness')
+		graph = self.awareness.graph
+		link_to_port = self.awareness.link_to_port
+		if self.bw_graph_version != self.awareness.topology_version:
+			self.graph = self.create_bw_graph(self.free_bandwidth)
+			self.port_links = {}
+			for link in link_to_port:
+				(src_port, dst_port) = link_to_port[link]
+				self.port_links.setdefault((link[0], src_port), []).append(link)
+				self.port_links.setdefault((link[1], dst_port), []).append(link)
+			self.bw_graph_version = self.awareness.topology_version
+			self.logger.debug("save free bandwidth")
+			return set(link_to_port)
+		self.graph = graph
+		dirty = set()
+		for port_no in port_nos:
+			dirty.update(self.port_links.get((dpid, port_no), ()))
+		for link in dirty:
+			self._save_link_bw(graph, link, link_to_port[link], self.free_bandwidth)
+		return dirty
+
+	def _save_link_bw(self, graph, link, ports, bw_dict):
+		"""
+			Save the bandwidth of one link, the smaller free BW of its two ends.
+		"""
+		(src_dpid, dst_dpid) = link
+		(src_port, dst_port) = ports
+		if src_dpid in bw_dict and dst_dpid in bw_dict:
+			bandwidth = min(bw_dict[src_dpid].get(src_port, 0),
+							bw_dict[dst_dpid].get(dst_port, 0))
+		else:
+			bandwidth = 0
+		utilization = max(self.link_state.get_utilization(src_dpid, src_port),
+						  self.link_state.get_utilization(dst_dpid, dst_port))
+		if not graph.has_edge(src_dpid, dst_dpid):
+			graph.add_edge(src_dpid, dst_dpid)
+		graph[src_dpid][dst_dpid]['bandwidth'] = bandwidth
+		graph[src_dpid][dst_dpid]['utilization'] = utilization
 
 	@set_ev_cls(ofp_event.EventOFPStateChange,
 				[MAIN_DISPATCHER, DEAD_DISPATCHER])
@@ -118,27 +209,49 @@ class NetworkMonitor(app_manager.RyuApp):
 			if not datapath.id in self.datapaths:
 				self.logger.debug('register datapath: %016x', datapath.id)
 				self.datapaths[datapath.id] = datapath
+				self.port_features.setdefault(datapath.id, {})
+				self._request_port_desc(datapath)
+				self._schedule_datapath(datapath.id)
 		elif ev.state == DEAD_DISPATCHER:
 			if datapath.id in self.datapaths:
 				self.logger.debug('unregister datapath: %016x', datapath.id)
 				del self.datapaths[datapath.id]
+				self.flow_registry.remove_switch(datapath.id)
+				self.next_poll.pop(datapath.id, None)
+				self.poll_interval.pop(datapath.id, None)
+				self.stats['port'].pop(datapath.id, None)
+				self.stats['flow'].pop(datapath.id, None)
 		else:
 			pass
 
+	@set_ev_cls(ofp_event.EventOFPFlowRemoved, MAIN_DISPATCHER)
+	def _flow_removed_handler(self, ev):
+		msg = ev.msg
+		self.flow_registry.remove_entry(msg.datapath.id, msg.cookie)
+
 	@set_ev_cls(ofp_event.EventOFPFlowStatsReply, MAIN_DISPATCHER)
 	def _flow_stats_reply_handler(self, ev):
-		
-		body = ev.msg.body
-		dpid = ev.msg.datapath.id
+		"""
+			Replies only hold the reactive entries egressing out the
+			congested port, see request_flow_stats.
+		"""
+		msg = ev.msg
+		dpid = msg.datapath.id
+		key = self.flow_stats_xids.get(msg.xid)
+		if key is None:
+			# Timed out and already re-requested.
+			return
+		self.flow_stats_parts.setdefault(msg.xid, []).extend(msg.body)
+		if msg.flags & msg.datapath.ofproto.OFPMPF_REPLY_MORE:
+			return
+		body = self.flow_stats_parts.pop(msg.xid)
+		del self.flow_stats_xids[msg.xid]
+		del self.flow_stats_pending[key]
+		self.sw_out_inf[dpid] = key[1]
 		self.stats['flow'][dpid] = body
-		self.flow_speed.setdefault(dpid, {})
-		# excluding the proactive flow entries
-		if dpid in self.edgdps:
-			flow_num = len(body) - 6
-		elif dpid in self.cordps:
-			flow_num = len(body) - 18
-		elif dpid in self.aggdps:
-			flow_num = len(body) - 6
+		self.telemetry.gauge('flow_stats.entries.%d' % dpid, len(body))
+		self.flow_speed.save_flow_stats(dpid, body, self.poll_interval.get(dpid, setting.MONITOR_PERIOD))
+		flow_num = len(body)
 		paths = []
                 m_paths = []
 		flow_port = {}
@@ -156,7 +269,7 @@ class NetworkMonitor(app_manager.RyuApp):
                         #        print([stat.match.get('ipv4_src'), stat.match.get('ipv4_dst'), stat.priority])
                         #        print('m_paths',m_paths)
 
-			# elephant flows detection egressing out a specific port by considering just elephant flows whose size above 50 KB, TCP flows, and egress out the port specified in sw_out_inf
+			# elephant flows detection egressing out a specific port by considering just elephant flows whose rate stays above ELEPHANT_RATE, TCP flows, and egress out the port specified in sw_out_inf
                         
                        # for stat in sorted([flow for flow in body ],
 		       # 				   key=lambda flow: (flow.priority, flow.match.get('ipv4_src'), flow.match.get('ipv4_dst'))):
@@ -170,7 +283,7 @@ class NetworkMonitor(app_manager.RyuApp):
                        #         print([stat.match.get('ipv4_src'), stat.match.get('ipv4_dst'), stat.priority])
  
 
-			for stat in sorted([flow for flow in body if ((flow.priority not in [0, 1000, 10, 65535]) and (flow.instructions[0].actions[0].port == self.sw_out_inf[dpid]) and flow.packet_count > 50 and flow.match.get('tcp_src'))],
+			for stat in sorted([flow for flow in body if ((cookie_class(flow.cookie) != COOKIE_MICE) and (flow.instructions[0].actions[0].port == self.sw_out_inf[dpid]) and flow.match.get('tcp_src') and self.flow_speed.is_elephant(dpid, flow_key(flow.match), self.elephant_rate, setting.ELEPHANT_SUSTAIN))],
 							   key=lambda flow: (flow.priority, flow.match.get('ipv4_src'), flow.match.get('ipv4_dst'))):
 				key2 = (dpid, stat.instructions[0].actions[0].port,stat.byte_count)
 				# creating a list of the detected elephant flows
@@ -182,18 +295,8 @@ class NetworkMonitor(app_manager.RyuApp):
 			if key2 and key1 == None:
 				flow_port[key2] = paths
 				port_flow_num = len(flow_port[key2])
-				if dpid > 3000:
-					capacity = self.port_capacity[3][stat.instructions[0].actions[0].port]  #capacity 10000
-                                        load_thre = 0.35
-				elif dpid > 2000:
-					capacity = self.port_capacity[2][stat.instructions[0].actions[0].port]  #capacity 20000
-                                        if stat.instructions[0].actions[0].port in (1,2):
-						load_thre = 0.35
-					else:
-						load_thre = 0.35
-				else:
-					capacity = 100000
-					load_thre = 0.35
+				capacity = self.get_port_capacity(dpid, self.sw_out_inf[dpid])
+				load_thre = 0.35
 				# compute the occupied BW on a specific port
 				load_current_port = round((1 - (self.free_bandwidth[dpid][self.sw_out_inf[dpid]]/capacity)),1)
 				# compute the total number of elephant flows must be rescheduled based on the BW occupation and the number of elephant flows
@@ -204,7 +307,8 @@ class NetworkMonitor(app_manager.RyuApp):
 				else:
 					self.redir_flow_num = int(port_flow_num*load_current_port)
 			        #print('dpid, current load, capacity, load thre',dpid,load_current_port,capacity,load_thre)	
-				print "we should redirect the followig number of flows:", self.redir_flow_num
+				self.telemetry.event('redirect', dpid=dpid, port=self.sw_out_inf[dpid],
+									 load=load_current_port, flows=self.redir_flow_num)
                                 if self.redir_flow_num != 0:
                                         self.r_times.append(1)
 				self.totalCount += self.redir_flow_num
@@ -215,108 +319,61 @@ class NetworkMonitor(app_manager.RyuApp):
 					for i in range(0,self.redir_flow_num):
 						self.get_path_by_fqouta(dpid, flow_port[key2][i][1], 2048, flow_port[key2][i][2], flow_port[key2][i][3], flow_port[key2][i][4], flow_port[key2][i][5], 30, key2[1], self.free_bandwidth[dpid][self.sw_out_inf[dpid]], self.redir_flow_num)
 				else:
-					print "Either no flows should be redirected or the load is below the threshold"
+					# Either no flows should be redirected or the load is below the threshold.
+					self.telemetry.incr('monitor.redirect_skipped')
                                 
 		else:
-			print "No flow_num <= 0"
+			self.telemetry.incr('monitor.flow_stats_empty')
 			
 
 	@set_ev_cls(ofp_event.EventOFPPortStatsReply, MAIN_DISPATCHER)
 	def _port_stats_reply_handler(self, ev):
 		
-                all_load=0
 		body = ev.msg.body
 		dpid = ev.msg.datapath.id
 		self.stats['port'][dpid] = body
 		self.free_bandwidth.setdefault(dpid, {})
-                l={}
-                load=[]
-		for stat in sorted(body, key=attrgetter('port_no')):
-			port_no = stat.port_no
-			if port_no != ofproto_v1_3.OFPP_LOCAL:
-				key = (dpid, port_no)
-				value = (stat.tx_bytes, stat.rx_bytes, stat.rx_errors,
-						 stat.duration_sec, stat.duration_nsec)
-				self._save_stats(self.port_stats, key, value, 5)
-
-				# Get port speed and Save it.
-				pre = 0
-				period = setting.MONITOR_PERIOD
-				tmp = self.port_stats[key]
-				if len(tmp) > 1:
-					# Calculate only the tx_bytes, not the rx_bytes. (hmc)
-					pre = tmp[-2][0]
-					period = self._get_period(tmp[-1][3], tmp[-1][4], tmp[-2][3], tmp[-2][4])
-				speed = self._get_speed(self.port_stats[key][-1][0], pre, period)
-                                #print('dpid, port no, speed',dpid,port_no,speed)
-				self._save_stats(self.port_speed, key, speed, 5)
-				self._save_freebandwidth(dpid, port_no, speed)
-                        #if dpid > 3000 and port_no in (1,2):
-                        #        l.append((20000 - self.free_bandwidth[dpid][port_no]) / 20000)
-                        #        all_load = all_load + (20000 - self.free_bandwidth[dpid][port_no]) / 20000
-                        #        print('dpid,port,load,free bw`:',dpid, port_no, round((20000 - self.free_bandwidth[dpid][port_no]) / 20000,2),self.free_bandwidth[dpid][port_no])
-                        #        print('all load',all_load)
-                        #        print('list len',len(l))
-                        #        print('list',l)
-                for i in xrange(3001,3009):
-                    if i in self.free_bandwidth:    
-                        l.setdefault(i,{})
-                        l[i][1]=round((20000 - self.free_bandwidth[i][1]) / 20000,3)
-                        l[i][2]=round((20000 - self.free_bandwidth[i][2]) / 20000,3)
-                        load.append(l[i][1])
-                        load.append(l[i][2])
-                if sum(load)/16 < 0.25:
-                    setting.MONITOR_PERIOD=10**round((0.25-sum(load)/16)/0.25,2)
-                else:
-                    setting.MONITOR_PERIOD=2
+		stats = [stat for stat in sorted(body, key=attrgetter('port_no'))
+				 if stat.port_no != ofproto_v1_3.OFPP_LOCAL]
+		# Save the counters and get port speeds of the whole reply at once.
+		# Calculate only the tx_bytes, not the rx_bytes. (hmc)
+		port_nos, speeds = self.link_state.save_port_stats(
+			dpid, stats, self.poll_interval.get(dpid, setting.MONITOR_PERIOD))
+		self._save_freebandwidth(dpid, port_nos)
+		links = self.update_bw_graph(dpid, port_nos.tolist())
+		self.update_best_paths(links)
+		self._update_poll_interval(dpid, port_nos.tolist())
+
 	@set_ev_cls(ofp_event.EventOFPPortDescStatsReply, MAIN_DISPATCHER)
 	def port_desc_stats_reply_handler(self, ev):
 		"""
 			Save port description info.
 		"""
-		msg = ev.msg
-		dpid = msg.datapath.id
-		ofproto = msg.datapath.ofproto
-
-		config_dict = {ofproto.OFPPC_PORT_DOWN: "Down",
-					   ofproto.OFPPC_NO_RECV: "No Recv",
-					   ofproto.OFPPC_NO_FWD: "No Farward",
-					   ofproto.OFPPC_NO_PACKET_IN: "No Packet-in"}
-
-		state_dict = {ofproto.OFPPS_LINK_DOWN: "Down",
-					  ofproto.OFPPS_BLOCKED: "Blocked",
-					  ofproto.OFPPS_LIVE: "Live"}
-
-		ports = []
+		dpid = ev.msg.datapath.id
+		features = self.port_features.setdefault(dpid, {})
 		for p in ev.msg.body:
-			ports.append('port_no=%d hw_addr=%s name=%s config=0x%08x '
-						 'state=0x%08x curr=0x%08x advertised=0x%08x '
-						 'supported=0x%08x peer=0x%08x curr_speed=%d '
-						 'max_speed=%d' %
-						 (p.port_no, p.hw_addr,
-						  p.name, p.config,
-						  p.state, p.curr, p.advertised,
-						  p.supported, p.peer, p.curr_speed,
-						  p.max_speed))
-
-			if p.config in config_dict:
-				config = config_dict[p.config]
-			else:
-				config = "up"
+			features[p.port_no] = self._port_feature(p)
+			self.capacity.update_port(dpid, p.port_no, p.curr_speed, p.max_speed)
 
-			if p.state in state_dict:
-				state = state_dict[p.state]
-			else:
-				state = "up"
-
-			# Recording data.
+	def _port_feature(self, p):
+		"""
 			port_feature = (config, state, p.curr_speed)
-			self.port_features[dpid][p.port_no] = port_feature
+		"""
+		config = PORT_CONFIG.get(p.config, "up")
+		state = PORT_STATE.get(p.state, "up")
+		return (config, state, p.curr_speed)
+
+	def get_port_capacity(self, dpid, port_no):
+		"""
+			Get the capacity (Kbit/s) of a port, see CapacityRegistry.get.
+		"""
+		return self.capacity.get(dpid, port_no)
 
 	@set_ev_cls(ofp_event.EventOFPPortStatus, MAIN_DISPATCHER)
 	def _port_status_handler(self, ev):
 		"""
-			Handle the port status changed event.
+			Handle the port status changed event and keep the port
+			feature cache up to date.
 		"""
 		msg = ev.msg
 		ofproto = msg.datapath.ofproto
@@ -329,21 +386,34 @@ class NetworkMonitor(app_manager.RyuApp):
 					   ofproto.OFPPR_MODIFY: "modified", }
 
 		if reason in reason_dict:
-			print "switch%d: port %s %s" % (dpid, reason_dict[reason], port_no)
+			self.logger.info("switch%d: port %s %s", dpid, reason_dict[reason], port_no)
 		else:
-			print "switch%d: Illeagal port state %s %s" % (dpid, port_no, reason)
+			self.logger.warning("switch%d: Illegal port state %s %s", dpid, port_no, reason)
+		features = self.port_features.setdefault(dpid, {})
+		if reason == ofproto.OFPPR_DELETE:
+			features.pop(port_no, None)
+			self.capacity.remove_port(dpid, port_no)
+		else:
+			features[port_no] = self._port_feature(msg.desc)
+			self.capacity.update_port(dpid, port_no, msg.desc.curr_speed, msg.desc.max_speed)
 
 	def _request_stats(self, datapath):
 		"""
-			Sending OFP_PORT_DESCRIPTION and OFP_PORT_STATS requests to all datapaths
+			Sending OFP_PORT_STATS request to a datapath
 		"""
 		self.logger.debug('send stats request: %016x', datapath.id)
 		ofproto = datapath.ofproto
 		parser = datapath.ofproto_parser
-		req = parser.OFPPortDescStatsRequest(datapath, 0)
-		datapath.send_msg(req)
 		req = parser.OFPPortStatsRequest(datapath, 0, ofproto.OFPP_ANY)
 		datapath.send_msg(req)
+
+	def _request_port_desc(self, datapath):
+		"""
+			Sending OFP_PORT_DESCRIPTION request to a datapath
+		"""
+		parser = datapath.ofproto_parser
+		req = parser.OFPPortDescStatsRequest(datapath, 0)
+		datapath.send_msg(req)
 	
 	def get_sw(self, dpid, in_port, src, dst):
 		"""
@@ -359,10 +429,10 @@ class NetworkMonitor(app_manager.RyuApp):
 				if src_sw and dst_sw:
 					return src_sw, dst_sw
 				else:
+					self.logger.info("Destination switch of %s not found.", dst)
 					return None
-					print "we couldn't find either the source or the destunation"
 			else:
-				print "no src sw"
+				self.logger.info("Source switch not found.")
 				return None
 		except KeyError:
 			traceback.print_exc()
@@ -395,14 +465,12 @@ class NetworkMonitor(app_manager.RyuApp):
 			will be the one whose bottleneck link has available BW more than that on
 			the under-threshold port.
 		"""
-		best_paths = copy.deepcopy(paths)
-                print('best_paths',best_paths)
 		max_bw_of_paths = speed
 		best_path = {}
 		pre = 1
 		curr = 1
 		for path in paths:
-			min_bw = 100000
+			min_bw = self.capacity.max_capacity()
 			max_bw = 0
 			min_bw, pre1, curr1 = self.get_min_bw_of_ports(graph, path, min_bw)
                         if min_bw > max_bw_of_paths and int(min_bw - speed) > 500: #and min_bw-(1-speed)>speed:
@@ -410,37 +478,52 @@ class NetworkMonitor(app_manager.RyuApp):
 				best_path = path
 				pre, curr = pre1, curr1
 		if len(best_path) > 0 and pre > 0 and curr > 0:
-                    print('reschedule path',best_path)
-                    logging.debug('reschedule path',best_path)
-		    return best_path, pre, curr
+			self.telemetry.event('reschedule_path', dpid=dpid, path=best_path)
+			return best_path, pre, curr
 		else:
 			return {}, 0, 0
         
-        def get_best_path_by_bw(self,graph,paths):
-            capabilities={}
-            best_paths=copy.deepcopy(paths)
-            
-            for src in paths:
-                for dst in paths[src]:
-                    if src == dst:
-                        best_paths[src][src]=[src]
-                        capabilities.setdefault(src,{src: 10000})
-                        capabilities[src][src]=10000
-                    else:
-                        max_bw_of_paths=0
-                        best_path=paths[src][dst][0]
-                        for path in paths[src][dst]:
-                            min_bw=10000
-                            min_bw=self.get_min_bw_of_ports(graph , path , min_bw)
-                            if min_bw > max_bw_of_paths:
-                                max_bw_of_paths = min_bw
-                                best_path = path
-                        best_paths[src][dst] = best_path
-                        capabilities.setdefault(src,{dst:max_bw_of_paths})
-                        capabilities[src][dst] = max_bw_of_paths
-            self.capabilities = capabilities
-            self.best_paths = best_paths
-            return capabilities,best_paths
+	def get_best_path_by_bw(self, graph, paths):
+		"""
+			Get (capabilities, best_paths) of all pairs from the best path
+			table. The table is only rebuilt when paths were recomputed,
+			bandwidth changes re-rank pairs in update_best_paths.
+		"""
+		self._check_best_path_table(graph, paths)
+		return self.capabilities, self.best_paths
+
+	def update_best_paths(self, links):
+		"""
+			Re-rank the pairs whose candidate paths use the updated links.
+		"""
+		if self.awareness is None or self.graph is None:
+			return
+		paths = self.awareness.shortest_paths
+		if not self._check_best_path_table(self.graph, paths):
+			self.best_path_table.update_links(links, self.graph)
+
+	def select_paths(self, src, dst):
+		"""
+			Get the (elephant_path, mice_path) pair for a new flow, or None
+			if no bandwidth information has been collected yet.
+		"""
+		if self.awareness is None or self.graph is None:
+			return None
+		self._check_best_path_table(self.graph, self.awareness.shortest_paths)
+		return self.best_path_table.select(src, dst)
+
+	def _check_best_path_table(self, graph, paths):
+		"""
+			Rebuild the best path table if paths changed since the last
+			build. Return True if it was rebuilt.
+		"""
+		version = getattr(self.awareness.path_cache, 'version', None)
+		if self.best_path_table.is_current(paths, version):
+			return False
+		self.best_path_table.rebuild(paths, graph, version)
+		self.capabilities = self.best_path_table.capabilities
+		self.best_paths = self.best_path_table.best_paths
+		return True
 
 	def get_port_pair_from_link(self, link_to_port, src_dpid, dst_dpid):
 
@@ -469,17 +552,23 @@ class NetworkMonitor(app_manager.RyuApp):
 		else:
 			return {}, 0, 0
 	
-	def add_flow(self, dp, priority, match, actions, hard_timeout):
+	def add_flow(self, dp, priority, match, actions, hard_timeout, cookie=0):
+		dp.send_msg(self.build_flow_mod(dp, priority, match, actions, hard_timeout, cookie))
+
+	def build_flow_mod(self, dp, priority, match, actions, hard_timeout, cookie=0):
 		ofproto = dp.ofproto
 		parser = dp.ofproto_parser
 		inst = [parser.OFPInstructionActions(ofproto.OFPIT_APPLY_ACTIONS, actions)]
-		mod = parser.OFPFlowMod(datapath=dp, priority=priority,
-								hard_timeout=hard_timeout,
+		flags = ofproto.OFPFF_SEND_FLOW_REM if is_reactive(cookie) else 0
+		mod = parser.OFPFlowMod(datapath=dp, cookie=cookie, priority=priority,
+								hard_timeout=hard_timeout, flags=flags,
 								match=match, instructions=inst)
-		dp.send_msg(mod)
+		return mod
 
-	def send_flow_mod(self, datapath, flow_info, src_port, dst_port):
-		
+	def get_flow_mod(self, datapath, flow_info, src_port, dst_port, cookie):
+		"""
+			Build the flow-mod of a rescheduled flow for one hop of the path.
+		"""
 		parser = datapath.ofproto_parser
 		actions = []
 		actions.append(parser.OFPActionOutput(dst_port))
@@ -494,39 +583,61 @@ class NetworkMonitor(app_manager.RyuApp):
 						ipv4_src=flow_info[1], ipv4_dst=flow_info[2])
 		#if we need to modify the timeout so we can do it here
 		priority = flow_info[-1] + 1
-		self.add_flow(datapath, priority, match, actions,
-					  hard_timeout=6)
+		return self.build_flow_mod(datapath, priority, match, actions,
+					  hard_timeout=6, cookie=cookie)
 		
 	def install_flow(self, datapaths, link_to_port, path, flow_info):
 		
                 
 		if path is None or len(path) == 0:
-			print "Path error is zero length!"
 			self.logger.info("Path error!")
 			return
 		in_port = flow_info[3]
 		first_dp = datapaths[path[0]]
 		out_port = first_dp.ofproto.OFPP_LOCAL
 		self.flwEntryCount += 1
-		# Install flow entry for intermediate datapaths.
+		#  Flow entry for the first datapath.
+		port_pair = self.get_port_pair_from_link(link_to_port, path[0], path[1])
+		if port_pair is None:
+			self.logger.info("Port not found in first hop.")
+			return
+		out_port = port_pair[0]
+		cookie = self.flow_registry.new_cookie(COOKIE_RESCHEDULED)
+		hops = [(first_dp, self.get_flow_mod(first_dp, flow_info, in_port, out_port, cookie))]
+		# Flow entries for intermediate datapaths.
 		for i in xrange(1, len(path) - 1):
 			port = self.get_port_pair_from_link(link_to_port, path[i-1], path[i])
 			port_next = self.get_port_pair_from_link(link_to_port, path[i], path[i+1])
 			if port and port_next:
 				src_port, dst_port = port[1], port_next[0]
 				datapath = datapaths[path[i]]
-				self.send_flow_mod(datapath, flow_info, src_port, dst_port)
+				hops.append((datapath, self.get_flow_mod(datapath, flow_info, src_port, dst_port, cookie)))
 			else:
-				print "we couldn't find the port pais for the intermediate dp"
-		
-		#  Install flow entry for the first datapath.
-		port_pair = self.get_port_pair_from_link(link_to_port, path[0], path[1])
-		if port_pair is None:
-			print "we couldn't find the port_pair of the first dp"
-			self.logger.info("Port not found in first hop.")
-			return
-		out_port = port_pair[0]
-		self.send_flow_mod(first_dp, flow_info, in_port, out_port)
+				self.logger.info("Port not found in intermediate hop %s.", path[i])
+		self.flow_registry.register(cookie, path, [mod for dp, mod in hops],
+									(flow_info[1], flow_info[2], flow_info[5], flow_info[6]))
+		# Install the new path egress first so the first hop never points at a missing entry.
+		self.path_installer.install(hops, path=tuple(path))
+
+	@set_ev_cls(ofp_event.EventOFPBarrierReply, MAIN_DISPATCHER)
+	def _barrier_reply_handler(self, ev):
+		self.path_installer.barrier_reply(ev.msg)
+
+	def delete_flow(self, cookie):
+		"""
+			Delete every entry of a registered flow with one cookie-matched
+			OFPFC_DELETE per switch it was installed on.
+		"""
+		for dpid in self.flow_registry.forget(cookie):
+			datapath = self.datapaths.get(dpid)
+			if datapath is None:
+				continue
+			ofproto = datapath.ofproto
+			parser = datapath.ofproto_parser
+			datapath.send_msg(parser.OFPFlowMod(
+				datapath=datapath, cookie=cookie, cookie_mask=COOKIE_FULL_MASK,
+				table_id=ofproto.OFPTT_ALL, command=ofproto.OFPFC_DELETE,
+				out_port=ofproto.OFPP_ANY, out_group=ofproto.OFPG_ANY))
 	
 	def get_path_by_fqouta(self, dpid, in_port, eth_type, ip_src, ip_dst, L4_sport, L4_dport, priority, outgoing_inf, speed, flownumber):
 		"""
@@ -548,9 +659,9 @@ class NetworkMonitor(app_manager.RyuApp):
 								  path, flow_info)
 				else:
 					self.failCount += 1
-					print "No path found at all under the specified conditions"
+					self.logger.info("No path found under the specified conditions.")
 		else:
-			print "src_sw, dst_sw couldn't be found"
+			self.logger.info("src_sw, dst_sw not found.")
 			
 	
 	def create_bw_graph(self, bw_dict):
@@ -561,24 +672,8 @@ class NetworkMonitor(app_manager.RyuApp):
 			graph = self.awareness.graph
 			link_to_port = self.awareness.link_to_port
 			for link in link_to_port:
-				(src_dpid, dst_dpid) = link
-				(src_port, dst_port) = link_to_port[link]
-				if src_dpid in bw_dict and dst_dpid in bw_dict:
-					bw_src = bw_dict[src_dpid][src_port]
-					bw_dst = bw_dict[dst_dpid][dst_port]
-					bandwidth = min(bw_src, bw_dst)
-					# Add key:value pair of bandwidth into graph.
-					if graph.has_edge(src_dpid, dst_dpid):
-						graph[src_dpid][dst_dpid]['bandwidth'] = bandwidth
-					else:
-						graph.add_edge(src_dpid, dst_dpid)
-						graph[src_dpid][dst_dpid]['bandwidth'] = bandwidth
-				else:
-					if graph.has_edge(src_dpid, dst_dpid):
-						graph[src_dpid][dst_dpid]['bandwidth'] = 0
-					else:
-						graph.add_edge(src_dpid, dst_dpid)
-						graph[src_dpid][dst_dpid]['bandwidth'] = 0
+				# Add key:value pair of bandwidth into graph.
+				self._save_link_bw(graph, link, link_to_port[link], bw_dict)
 			return graph
 		except:
 			self.logger.info("Create bw graph exception")
@@ -586,93 +681,70 @@ class NetworkMonitor(app_manager.RyuApp):
 				self.awareness = lookup_service_brick('awareness')
 			return self.awareness.graph
 
-	def _save_freebandwidth(self, dpid, port_no, speed):
+	def _save_freebandwidth(self, dpid, port_nos):
 		"""
-			Calculate free bandwidth of port and Save it.
+			Calculate free bandwidth of ports and Save it.
 			port_feature = (config, state, p.curr_speed)
 			self.port_features[dpid][p.port_no] = port_feature
 			self.free_bandwidth = {dpid:{port_no:free_bw,},}
 			We compute the free BW based on the difference between
 			link capacity and the current speed.
 			in case the free bandwidth is below the predefined threshold,
-			then send OFP_FLOW_Stats request to poll all flow information
-			on port_no
+			then send OFP_FLOW_Stats request to poll the reactive flows
+			egressing out port_no
 		"""
 		self.free_bandwidth.setdefault(dpid, {})
-		port_state = self.port_features.get(dpid).get(port_no)
-		if port_state:
-			
-			if dpid > 3000:
-				#capacity = self.port_capacity[3][port_no]
-                                capacity = 20000
-
-
-			elif dpid > 2000:
-				#capacity = self.port_capacity[2][port_no]
-                                capacity = 20000
-
-			else:
-				#capacity = 100000
-                                capacity = 20000
-
-			
-			free_bw = self._get_free_bw(capacity, speed)
-			self.free_bandwidth[dpid].setdefault(port_no, 0)
-			self.free_bandwidth[dpid][port_no] = free_bw
-                        #print('dpid, port no, free bw', dpid, port_no, self.free_bandwidth[dpid][port_no]) 
-                       # all_load=0
-                       # if dpid > 3000 and port_no in (1,2):
-                       #     l.append((capacity - self.free_bandwidth[dpid][port_no]) / capacity)
-                       #     all_load = all_load + (capacity - self.free_bandwidth[dpid][port_no]) / capacity
-                       #     print('dpid,port,load',dpid, port_no, (capacity - self.free_bandwidth[dpid][port_no]) / capacity)
-                       #     print('all load',all_load)
-                       #     print(
+		features = self.port_features.get(dpid, {})
+		up_ports = [port_no for port_no in port_nos.tolist() if features.get(port_no)]
+		if len(up_ports) < len(port_nos):
+			self.logger.info("Port is Down")
+		if not up_ports:
+			return
+		port_nos = up_ports
+		capacity = [self.get_port_capacity(dpid, port_no) for port_no in port_nos]
+		free_bws = self.link_state.save_free_bw(dpid, port_nos, capacity).tolist()
+		self.free_bandwidth[dpid].update(zip(port_nos, free_bws))
+		for port_no, cap, free_bw in zip(port_nos, capacity, free_bws):
 			if dpid in self.edgdps and port_no in [1,2]:
-				if free_bw < 15000:
-					self.sw_out_inf[dpid] = port_no
+				congested = free_bw < cap * (1 - setting.CONGESTION_UTILIZATION)
+				if congested and self.request_flow_stats(dpid, port_no):
 					self.fsCount += 1
-					datapath = self.datapaths[dpid]
-					ofproto = datapath.ofproto
-					parser = datapath.ofproto_parser
-					req = parser.OFPFlowStatsRequest(datapath)
-					datapath.send_msg(req)
-		else:
-			self.logger.info("Port is Down")
-                if dpid > 3000:
-                        print('time',round(time.time() - self.s))
-                        print('dpid',dpid)
-                        print('port no',port_no)
-                        print('free bw',self.free_bandwidth[dpid][port_no])
-
-	def _save_stats(self, _dict, key, value, length=5):
-		if key not in _dict:
-			_dict[key] = []
-		_dict[key].append(value)
-		if len(_dict[key]) > length:
-			_dict[key].pop(0)
-
-	def _get_speed(self, now, pre, period):
-		if period:
-			return (now - pre) / (period)
-		else:
-			return 0
-
-	def _get_free_bw(self, capacity, speed):
-		#freebw: Kbit/s
-		return max(capacity - speed * 8 / 1000.0, 0)
-
-	def _get_time(self, sec, nsec):
-		return sec + nsec / 1000000000.0
+			if dpid > 3000:
+				self.telemetry.event('free_bw', time=round(time.time() - self.s),
+									 dpid=dpid, port=port_no, free_bw=free_bw)
 
-	def _get_period(self, n_sec, n_nsec, p_sec, p_nsec):
-		return self._get_time(n_sec, n_nsec) - self._get_time(p_sec, p_nsec)
+	def request_flow_stats(self, dpid, port_no):
+		"""
+			Request the reactive entries (COOKIE_REACTIVE) egressing out
+			port_no, unless a request for the same port is still in flight.
+			Return True if a request was sent.
+		"""
+		key = (dpid, port_no)
+		now = time.time()
+		pending = self.flow_stats_pending.get(key)
+		if pending:
+			if now - pending[1] < setting.FLOW_STATS_TIMEOUT:
+				return False
+			self.flow_stats_xids.pop(pending[0], None)
+			self.flow_stats_parts.pop(pending[0], None)
+		datapath = self.datapaths[dpid]
+		ofproto = datapath.ofproto
+		parser = datapath.ofproto_parser
+		req = parser.OFPFlowStatsRequest(datapath, 0, ofproto.OFPTT_ALL,
+										 port_no, ofproto.OFPG_ANY,
+										 COOKIE_REACTIVE, COOKIE_REACTIVE_MASK)
+		datapath.set_xid(req)
+		self.flow_stats_pending[key] = (req.xid, now)
+		self.flow_stats_xids[req.xid] = key
+		datapath.send_msg(req)
+		return True
 
 	def show_stat(self, _type):
 		'''
 			Show statistics information according to data type.
 			_type: 'port' / 'flow'
 		'''
-		if setting.TOSHOW is False:
+		if setting.TOSHOW < LEVEL_SUMMARY:
 			return
 
 		bodys = self.stats[_type]
@@ -691,7 +763,7 @@ class NetworkMonitor(app_manager.RyuApp):
 						dpid,
 						stat.priority, stat.match.get('ipv4_src'), stat.match.get('ipv4_dst'),
 						stat.packet_count, stat.byte_count,
-						abs(self.flow_speed[dpid][(stat.priority, stat.match.get('ipv4_src'), stat.match.get('ipv4_dst'))][-1])*8/1000.0))
+						abs(self.flow_speed.get_rate(dpid, flow_key(stat.match)))*8/1000.0))
 			print
 
 		if _type == 'port':
@@ -711,8 +783,8 @@ class NetworkMonitor(app_manager.RyuApp):
 							dpid, stat.port_no,
 							stat.rx_packets, stat.rx_bytes,
 							stat.tx_packets, stat.tx_bytes,
-							10000,
-							abs(self.port_speed[(dpid, stat.port_no)][-1] * 8),
+							self.get_port_capacity(dpid, stat.port_no),
+							abs(self.link_state.get_speed(dpid, stat.port_no) * 8),
 							self.free_bandwidth[dpid][stat.port_no],
 							self.port_features[dpid][stat.port_no][0],
 							self.port_features[dpid][stat.port_no][1]))
@@ -0,0 +1,73 @@
+"""
+Packet-in guards of ShortestForwarding.
+PendingFlows remembers, for a short TTL, the output port of every switch
+on a path being installed, so duplicate packet-ins of the same flow are
+only packet-out instead of recomputing and reinstalling the path.
+TokenBuckets caps the packet-in rate handled per switch.
+"""
+import time
+from collections import deque
+
+
+class PendingFlows(object):
+	"""
+		self.flows = {flow_key:(expire_time, {dpid:out_port,}),}
+		flow_key = (ip_src, ip_dst, ip_proto, L4_sport, L4_dport)
+	"""
+
+	def __init__(self, ttl=1.0):
+		self.ttl = ttl
+		self.flows = {}
+		self.expiry = deque()       # (expire_time, flow_key) in insertion order
+
+	def add(self, key, ports, now=None):
+		now = time.time() if now is None else now
+		self.expire(now)
+		expire_time = now + self.ttl
+		self.flows[key] = (expire_time, ports)
+		self.expiry.append((expire_time, key))
+
+	def get_port(self, key, dpid, now=None):
+		"""
+			Get the out port of dpid for a flow still being installed,
+			or None.
+		"""
+		now = time.time() if now is None else now
+		entry = self.flows.get(key)
+		if entry is None or entry[0] <= now:
+			return None
+		return entry[1].get(dpid)
+
+	def expire(self, now=None):
+		now = time.time() if now is None else now
+		while self.expiry and self.expiry[0][0] <= now:
+			expire_time, key = self.expiry.popleft()
+			entry = self.flows.get(key)
+			# A re-added flow has a later expire_time and stays.
+			if entry is not None and entry[0] == expire_time:
+				del self.flows[key]
+
+
+class TokenBuckets(object):
+	"""
+		One token bucket per switch: rate tokens per second, up to burst.
+		self.buckets = {dpid:(tokens, last_refill),}
+	"""
+
+	def __init__(self, rate, burst):
+		self.rate = rate
+		self.burst = burst
+		self.buckets = {}
+
+	def consume(self, dpid, now=None):
+		"""
+			Take a token of dpid. Return False if its bucket is empty.
+		"""
+		now = time.time() if now is None else now
+		tokens, last = self.buckets.get(dpid, (self.burst, now))
+		tokens = min(self.burst, tokens + (now - last) * self.rate)
+		if tokens < 1:
+			self.buckets[dpid] = (tokens, now)
+			return False
+		self.buckets[dpid] = (tokens - 1, now)
+		return True
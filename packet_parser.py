@@ -0,0 +1,110 @@
+"""
+Fixed-offset packet-in decoder shared by the Ryu apps.
+Only the eth/arp/ipv4/tcp/udp fields the controller uses are pulled out of
+msg.data, and the result is cached on the message so every handler of the
+same EventOFPPacketIn reuses one decode instead of building packet.Packet.
+"""
+import socket
+import struct
+
+
+ETH_TYPE_IP = 0x0800
+ETH_TYPE_ARP = 0x0806
+ETH_TYPE_8021Q = 0x8100
+IPPROTO_TCP = 6
+IPPROTO_UDP = 17
+
+_ETH = struct.Struct('!6s6sH')
+_VLAN = struct.Struct('!HH')
+_ARP = struct.Struct('!HHBBH6s4s6s4s')
+_PORTS = struct.Struct('!HH')
+
+
+class ParsedPacket(object):
+	"""
+		Decoded header fields of a packet-in. Fields of protocols that
+		are not present stay None.
+	"""
+	__slots__ = ('eth_src', 'eth_dst', 'ethertype',
+				 'arp_src_ip', 'arp_dst_ip', 'arp_src_mac',
+				 'ip_src', 'ip_dst', 'ip_proto',
+				 'src_port', 'dst_port')
+
+	def __init__(self):
+		for field in self.__slots__:
+			setattr(self, field, None)
+
+	@property
+	def is_arp(self):
+		return self.arp_src_ip is not None
+
+	@property
+	def is_ipv4(self):
+		return self.ip_src is not None
+
+	@property
+	def is_tcp(self):
+		return self.ip_proto == IPPROTO_TCP and self.src_port is not None
+
+	@property
+	def is_udp(self):
+		return self.ip_proto == IPPROTO_UDP and self.src_port is not None
+
+
+def _mac(raw):
+	return ':'.join('%02x' % b for b in struct.unpack('!6B', raw))
+
+
+def parse(data):
+	"""
+		Decode eth/arp/ipv4/tcp/udp headers of data at fixed offsets.
+		Truncated or unknown headers are left undecoded.
+	"""
+	pkt = ParsedPacket()
+	if data is None or len(data) < _ETH.size:
+		return pkt
+	dst, src, ethertype = _ETH.unpack_from(data, 0)
+	offset = _ETH.size
+	if ethertype == ETH_TYPE_8021Q and len(data) >= offset + _VLAN.size:
+		ethertype = _VLAN.unpack_from(data, offset)[1]
+		offset += _VLAN.size
+	pkt.eth_dst = _mac(dst)
+	pkt.eth_src = _mac(src)
+	pkt.ethertype = ethertype
+
+	if ethertype == ETH_TYPE_ARP:
+		if len(data) < offset + _ARP.size:
+			return pkt
+		(hwtype, proto, hlen, plen, opcode,
+		 src_mac, src_ip, dst_mac, dst_ip) = _ARP.unpack_from(data, offset)
+		if proto == ETH_TYPE_IP and hlen == 6 and plen == 4:
+			pkt.arp_src_mac = _mac(src_mac)
+			pkt.arp_src_ip = socket.inet_ntoa(src_ip)
+			pkt.arp_dst_ip = socket.inet_ntoa(dst_ip)
+	elif ethertype == ETH_TYPE_IP:
+		if len(data) < offset + 20:
+			return pkt
+		ver_ihl, = struct.unpack_from('!B', data, offset)
+		frag, = struct.unpack_from('!H', data, offset + 6)
+		proto, = struct.unpack_from('!B', data, offset + 9)
+		pkt.ip_proto = proto
+		pkt.ip_src = socket.inet_ntoa(data[offset + 12:offset + 16])
+		pkt.ip_dst = socket.inet_ntoa(data[offset + 16:offset + 20])
+		# Only the first fragment carries the L4 header.
+		l4 = offset + (ver_ihl & 0x0f) * 4
+		if (frag & 0x1fff) == 0 and proto in (IPPROTO_TCP, IPPROTO_UDP) \
+				and len(data) >= l4 + _PORTS.size:
+			pkt.src_port, pkt.dst_port = _PORTS.unpack_from(data, l4)
+	return pkt
+
+
+def decode_packet_in(msg):
+	"""
+		Return the ParsedPacket of a packet-in message, decoding it only
+		the first time any app asks for it.
+	"""
+	pkt = getattr(msg, '_parsed_packet', None)
+	if pkt is None:
+		pkt = parse(msg.data)
+		msg._parsed_packet = pkt
+	return pkt
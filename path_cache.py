@@ -0,0 +1,152 @@
+"""
+Incremental k shortest paths cache for NetworkAwareness.
+Instead of recomputing all pairs on every topology event, the cache
+diffs the edges of the new graph against the last one and only
+recomputes the (src, dst) pairs that a changed edge can affect.
+"""
+import networkx as nx
+
+
+class PathCache(object):
+	"""
+		PathCache keeps the k shortest paths of every pair of datapaths
+		and an index from each directed edge to the pairs whose cached
+		paths cross it.
+		self.paths = {dpid:{dpid:[[path],],},}
+		self.edge_index = {(src_dpid,dst_dpid):set((src,dst),),}
+	"""
+
+	def __init__(self, path_func, k=4, weight='weight'):
+		# path_func(graph, src, dst, weight=weight, k=k) -> [[path],] or None
+		self.path_func = path_func
+		self.k = k
+		self.weight = weight
+		self.paths = {}
+		self.edge_index = {}
+		self.bound = {}                 # {(src,dst):cost of the k-th cached path,}
+		self.nodes = set()
+		self.edges = set()
+		self.version = 0
+		self.changed_pairs = set()
+
+	def update(self, graph):
+		"""
+			Bring the cache in line with graph and return self.paths.
+			Only the pairs touched by added/removed nodes and edges
+			are recomputed. Every pair of a new node is stale anyway, so
+			only old pairs are checked against the added edges and nodes,
+			and not at all once every pair is stale (the first build).
+		"""
+		nodes = set(graph.nodes())
+		edges = set((u, v) for (u, v) in graph.edges() if u != v)
+		added_nodes = nodes - self.nodes
+		removed_nodes = self.nodes - nodes
+		added_edges = edges - self.edges
+		removed_edges = self.edges - edges
+
+		stale = set()
+		for node in removed_nodes:
+			self._drop_node(node)
+		for edge in removed_edges:
+			stale.update(self.edge_index.pop(edge, ()))
+		stale = set((src, dst) for (src, dst) in stale
+					if src in nodes and dst in nodes)
+		for node in added_nodes:
+			self.paths[node] = {node: [[node] for i in xrange(self.k)]}
+			for other in nodes:
+				if other != node:
+					stale.add((node, other))
+					stale.add((other, node))
+
+		all_pairs = len(nodes) * (len(nodes) - 1)
+		for (u, v) in added_edges:
+			if len(stale) >= all_pairs:
+				break
+			if u in added_nodes or v in added_nodes:
+				continue
+			stale.update(self._pairs_improved_by(
+				graph, u, v, graph[u][v].get(self.weight, 1), stale))
+		for node in added_nodes:
+			# Old pairs may now be routed through the new node.
+			if len(stale) >= all_pairs:
+				break
+			stale.update(self._pairs_improved_by(graph, node, node, 0, stale))
+
+		for src, dst in stale:
+			self._compute(graph, src, dst)
+
+		self.nodes = nodes
+		self.edges = edges
+		self.changed_pairs = stale
+		if stale or removed_nodes:
+			self.version += 1
+		return self.paths
+
+	def pairs_on_edge(self, src_dpid, dst_dpid):
+		"""
+			Get the pairs whose cached paths cross the link.
+		"""
+		return self.edge_index.get((src_dpid, dst_dpid), set())
+
+	def _compute(self, graph, src, dst):
+		self._unindex(src, dst)
+		paths = self.path_func(graph, src, dst, weight=self.weight, k=self.k)
+		self.paths.setdefault(src, {src: [[src] for i in xrange(self.k)]})
+		self.paths[src][dst] = paths
+		if not paths:
+			self.bound[(src, dst)] = float('inf')
+			return
+		for path in paths:
+			for edge in zip(path[:-1], path[1:]):
+				self.edge_index.setdefault(edge, set()).add((src, dst))
+		if len(paths) < self.k:
+			self.bound[(src, dst)] = float('inf')
+		else:
+			self.bound[(src, dst)] = self._cost(graph, paths[-1])
+
+	def _unindex(self, src, dst):
+		paths = self.paths.get(src, {}).get(dst)
+		if not paths:
+			return
+		for path in paths:
+			for edge in zip(path[:-1], path[1:]):
+				pairs = self.edge_index.get(edge)
+				if pairs:
+					pairs.discard((src, dst))
+					if not pairs:
+						del self.edge_index[edge]
+
+	def _drop_node(self, node):
+		for dst in list(self.paths.get(node, {})):
+			self._unindex(node, dst)
+			self.bound.pop((node, dst), None)
+		self.paths.pop(node, None)
+		for src in self.paths:
+			if node in self.paths[src]:
+				self._unindex(src, node)
+				del self.paths[src][node]
+				self.bound.pop((src, node), None)
+
+	def _pairs_improved_by(self, graph, u, v, w, skip):
+		"""
+			A new edge (u, v) of weight w (or a new node, u = v and w = 0)
+			can only enter the k shortest paths of (src, dst) if
+			dist(src, u) + w + dist(v, dst) is not longer than the k-th
+			cached path. Pairs in skip are not checked.
+		"""
+		to_u = nx.single_source_dijkstra_path_length(
+			graph.reverse(copy=False), u, weight=self.weight)
+		from_v = nx.single_source_dijkstra_path_length(
+			graph, v, weight=self.weight)
+		pairs = set()
+		for src, d_src in to_u.items():
+			for dst, d_dst in from_v.items():
+				if src == dst or (src, dst) in skip:
+					continue
+				if d_src + w + d_dst <= self.bound.get((src, dst), float('inf')):
+					pairs.add((src, dst))
+		return pairs
+
+	def _cost(self, graph, path):
+		return sum(graph[u][v].get(self.weight, 1)
+				   for (u, v) in zip(path[:-1], path[1:]))
@@ -0,0 +1,151 @@
+"""
+Batched flow installation along a path.
+Flow-mods of a path are sent egress first, optionally wrapped in an
+OpenFlow 1.3 ONF bundle, and closed with a barrier on every switch. The
+packet-out of the first packet is held back until all barrier replies have
+arrived, so it can not overtake the downstream entries. An install whose
+replies do not arrive within the timeout is released anyway.
+"""
+import collections
+import time
+
+from ryu.lib import hub
+
+
+MODES = ('none', 'barrier', 'bundle')
+
+
+class PathInstaller(object):
+	"""
+		PathInstaller keeps the installs waiting for barrier replies and the
+		measured install latency of the recent paths.
+		self.pending = {(dpid, xid):install,}
+		self.latency = deque([(path, seconds),])
+		The latency stats are pushed as '<name>.count/mean/max' gauges.
+	"""
+
+	def __init__(self, logger, mode='barrier', timeout=5, history=1000,
+				 telemetry=None, name='path_install'):
+		if mode not in MODES:
+			raise ValueError("Unknown path install mode: %s" % mode)
+		self.logger = logger
+		self.mode = mode
+		self.timeout = timeout
+		self.pending = {}
+		self.latency = collections.deque(maxlen=history)
+		self.bundle_id = {}             # {dpid:last bundle id,}
+		self.telemetry = telemetry
+		self.name = name
+		self.expire_thread = hub.spawn(self._expire_loop)
+
+	def install(self, hops, packet_out=None, path=None):
+		"""
+			hops = [(datapath, flow_mod),] ordered from ingress to egress.
+			packet_out = (datapath, packet_out_msg) or None.
+		"""
+		self._expire()
+		install = _Install(path, packet_out)
+		order = []
+		batches = {}
+		for datapath, mod in reversed(hops):
+			if datapath.id not in batches:
+				order.append(datapath)
+				batches[datapath.id] = []
+			batches[datapath.id].append(mod)
+
+		for datapath in order:
+			mods = batches[datapath.id]
+			if self.mode == 'bundle':
+				self._send_bundle(datapath, mods)
+			else:
+				for mod in mods:
+					datapath.send_msg(mod)
+			if self.mode != 'none':
+				req = datapath.ofproto_parser.OFPBarrierRequest(datapath)
+				datapath.send_msg(req)
+				install.waiting.add((datapath.id, req.xid))
+				self.pending[(datapath.id, req.xid)] = install
+
+		if not install.waiting:
+			self._finish(install)
+
+	def barrier_reply(self, msg):
+		"""
+			Feed an OFPBarrierReply. Release the packet-out of the path
+			once the last switch of the path has answered.
+		"""
+		key = (msg.datapath.id, msg.xid)
+		install = self.pending.pop(key, None)
+		if install is None:
+			return
+		install.waiting.discard(key)
+		if not install.waiting:
+			self._finish(install)
+
+	def latency_stats(self):
+		"""
+			Get (count, mean, max) of the recorded install latencies in seconds.
+		"""
+		if not self.latency:
+			return 0, 0.0, 0.0
+		values = [l for (p, l) in self.latency]
+		return len(values), sum(values) / len(values), max(values)
+
+	def _send_bundle(self, datapath, mods):
+		ofproto = datapath.ofproto
+		parser = datapath.ofproto_parser
+		bundle_id = self.bundle_id.get(datapath.id, 0) + 1
+		self.bundle_id[datapath.id] = bundle_id
+		flags = ofproto.ONF_BF_ATOMIC | ofproto.ONF_BF_ORDERED
+		datapath.send_msg(parser.ONFBundleCtrlMsg(
+			datapath, bundle_id, ofproto.ONF_BCT_OPEN_REQUEST, flags, []))
+		for mod in mods:
+			datapath.send_msg(parser.ONFBundleAddMsg(
+				datapath, bundle_id, flags, mod, []))
+		datapath.send_msg(parser.ONFBundleCtrlMsg(
+			datapath, bundle_id, ofproto.ONF_BCT_COMMIT_REQUEST, flags, []))
+
+	def _finish(self, install, timed_out=False):
+		if install.packet_out:
+			datapath, out = install.packet_out
+			datapath.send_msg(out)
+		if not timed_out:
+			self.latency.append((install.path, time.time() - install.start))
+
+	def _expire(self):
+		"""
+			Give up on the barrier replies of installs older than the
+			timeout and release their packet-out.
+		"""
+		now = time.time()
+		expired = []
+		for key, install in list(self.pending.items()):
+			if now - install.start > self.timeout:
+				del self.pending[key]
+				if install.waiting:
+					install.waiting.clear()
+					expired.append(install)
+		for install in expired:
+			self.logger.info("Barrier reply of path %s timed out, packet-out sent anyway."
+							 % (install.path,))
+			self._finish(install, timed_out=True)
+
+	def _expire_loop(self):
+		while True:
+			hub.sleep(self.timeout)
+			self._expire()
+			if self.telemetry is not None:
+				count, mean, maximum = self.latency_stats()
+				self.telemetry.gauge(self.name + '.count', count)
+				self.telemetry.gauge(self.name + '.mean', mean)
+				self.telemetry.gauge(self.name + '.max', maximum)
+
+
+class _Install(object):
+	__slots__ = ('path', 'packet_out', 'start', 'waiting')
+
+	def __init__(self, path, packet_out):
+		self.path = path
+		self.packet_out = packet_out
+		self.start = time.time()
+		self.waiting = set()
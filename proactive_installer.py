@@ -0,0 +1,153 @@
+"""
+Controller-side installation of the proactive fat-tree entries.
+The same edge downstream, group-based upstream and agg/core /16 routing
+entries that fattree.install_proactive loads with ovs-ofctl are built here
+from the dpid of every switch that connects, and pushed as one batch of
+GroupMod/FlowMod messages closed by a barrier.
+"""
+from ryu.base import app_manager
+from ryu.controller import ofp_event
+from ryu.controller.handler import CONFIG_DISPATCHER
+from ryu.controller.handler import set_ev_cls
+from ryu.lib.packet import ether_types
+from ryu.ofproto import ofproto_v1_3
+
+import setting
+from flow_registry import COOKIE_PROACTIVE
+
+
+class ProactiveInstaller(app_manager.RyuApp):
+	"""
+		ProactiveInstaller makes every fat-tree switch forwarding-ready on
+		EventOFPSwitchFeatures, without waiting for the emulator script.
+		Layer and position are read from the dpid (1xxx core, 2xxx
+		aggregate, 3xxx edge) as built by fattree.Fattree.
+	"""
+	OFP_VERSIONS = [ofproto_v1_3.OFP_VERSION]
+
+	def __init__(self, *args, **kwargs):
+		super(ProactiveInstaller, self).__init__(*args, **kwargs)
+		self.name = "proactive_installer"
+		self.fanout = setting.FATTREE_K
+		self.density = setting.FATTREE_DENSITY
+
+	@set_ev_cls(ofp_event.EventOFPSwitchFeatures, CONFIG_DISPATCHER)
+	def switch_features_handler(self, ev):
+		datapath = ev.msg.datapath
+		layer, num = divmod(datapath.id, 1000)
+		if layer == 3:
+			groups, flows = self.edge_rules(datapath, num)
+		elif layer == 2:
+			groups, flows = self.agg_rules(datapath, num)
+		elif layer == 1:
+			groups, flows = self.core_rules(datapath, num)
+		else:
+			self.logger.info("switch:%s is not a fat-tree switch", datapath.id)
+			return
+
+		ofproto = datapath.ofproto
+		parser = datapath.ofproto_parser
+		# Start from a clean group table so reconnects do not fail on GROUP_EXISTS.
+		datapath.send_msg(parser.OFPGroupMod(
+			datapath, ofproto.OFPGC_DELETE, ofproto.OFPGT_ALL, ofproto.OFPG_ALL))
+		for msg in groups + flows:
+			datapath.send_msg(msg)
+		datapath.send_msg(parser.OFPBarrierRequest(datapath))
+		self.logger.info("switch:%s proactive entries installed (%d groups, %d flows)",
+						 datapath.id, len(groups), len(flows))
+
+	def edge_rules(self, dp, num):
+		"""
+			Downstream: hosts of this edge by exact address.
+			Upstream: ARP through ECMP group 3, IP to the controller via group 1.
+		"""
+		parser = dp.ofproto_parser
+		half = self.fanout // 2
+		uplinks = range(1, half + 1)
+		groups = [self._group(dp, 1, [dp.ofproto.OFPP_CONTROLLER]),
+				  self._group(dp, 2, uplinks),
+				  self._group(dp, 3, uplinks)]
+		flows = []
+		for i in xrange(1, self.density + 1):
+			host = '10.%d.0.%d' % (num, i)
+			out = [parser.OFPActionOutput(half + i)]
+			flows.append(self._flow(dp, 1000, self._arp(dp, dst=host), out))
+			flows.append(self._flow(dp, 1000, self._ip(dp, dst=host), out))
+		for i in xrange(1, 1 + self.fanout ** 2 // 2):
+			if i == num:
+				continue
+			for j in xrange(1, half + 1):
+				for k in xrange(1, half + 1):
+					src = '10.%d.0.%d' % (num, j)
+					dst = '10.%d.0.%d' % (i, k)
+					flows.append(self._flow(dp, 10, self._arp(dp, src, dst),
+											[parser.OFPActionGroup(3)]))
+					flows.append(self._flow(dp, 10, self._ip(dp, src, dst),
+											[parser.OFPActionGroup(1)]))
+		return groups, flows
+
+	def agg_rules(self, dp, num):
+		"""
+			Downstream: the /16 subnets of the pod's edges.
+			Upstream: everything else through ECMP group 1 over the core uplinks.
+		"""
+		parser = dp.ofproto_parser
+		half = self.fanout // 2
+		first = (num - 1) // half * half + 1
+		flows = []
+		for k in xrange(1, half + 1):
+			subnet = ('10.%d.0.0' % (first + k - 1), '255.255.0.0')
+			out = [parser.OFPActionOutput(half + k)]
+			flows.append(self._flow(dp, 10, self._arp(dp, dst=subnet), out))
+			flows.append(self._flow(dp, 10, self._ip(dp, dst=subnet), out))
+		groups = [self._group(dp, 1, range(1, half + 1))]
+		flows.append(self._flow(dp, 10, self._arp(dp), [parser.OFPActionGroup(1)]))
+		flows.append(self._flow(dp, 10, self._ip(dp), [parser.OFPActionGroup(1)]))
+		return groups, flows
+
+	def core_rules(self, dp, num):
+		"""
+			Downstream only: the /16 subnet of every edge out of its pod's port.
+		"""
+		parser = dp.ofproto_parser
+		half = self.fanout // 2
+		flows = []
+		for i in xrange(1, 1 + self.fanout ** 2 // 2):
+			subnet = ('10.%d.0.0' % i, '255.255.0.0')
+			out = [parser.OFPActionOutput((i - 1) // half + 1)]
+			flows.append(self._flow(dp, 10, self._arp(dp, dst=subnet), out))
+			flows.append(self._flow(dp, 10, self._ip(dp, dst=subnet), out))
+		return [], flows
+
+	def _arp(self, dp, src=None, dst=None):
+		fields = {'eth_type': ether_types.ETH_TYPE_ARP}
+		if src:
+			fields['arp_spa'] = src
+		if dst:
+			fields['arp_tpa'] = dst
+		return dp.ofproto_parser.OFPMatch(**fields)
+
+	def _ip(self, dp, src=None, dst=None):
+		fields = {'eth_type': ether_types.ETH_TYPE_IP}
+		if src:
+			fields['ipv4_src'] = src
+		if dst:
+			fields['ipv4_dst'] = dst
+		return dp.ofproto_parser.OFPMatch(**fields)
+
+	def _group(self, dp, group_id, ports):
+		ofproto = dp.ofproto
+		parser = dp.ofproto_parser
+		buckets = [parser.OFPBucket(weight=1, watch_port=ofproto.OFPP_ANY,
+									watch_group=ofproto.OFPG_ANY,
+									actions=[parser.OFPActionOutput(port)])
+				   for port in ports]
+		return parser.OFPGroupMod(dp, ofproto.OFPGC_ADD, ofproto.OFPGT_SELECT,
+								  group_id, buckets)
+
+	def _flow(self, dp, priority, match, actions):
+		ofproto = dp.ofproto
+		parser = dp.ofproto_parser
+		inst = [parser.OFPInstructionActions(ofproto.OFPIT_APPLY_ACTIONS, actions)]
+		return parser.OFPFlowMod(datapath=dp, cookie=COOKIE_PROACTIVE, priority=priority,
+								 match=match, instructions=inst)
@@ -0,0 +1,343 @@
+"""
+Declarative traffic scenarios of the fat-tree experiments.
+A scenario is a spec (traffic matrix, elephant/mice mix, arrival process,
+durations, seed) that is compiled to a per-host schedule of commands and
+launched on time by a flow_agent.py in every host:
+
+	'label': 'CT',                 # scenario field of the result file names
+	'duration': 300,               # no new epoch starts after it (s)
+	'seed': 0,
+	'iperf_servers': {'hosts': 'all', 'port': 40000, 'udp': False},
+	'http_servers': {'hosts': 'all', 'port': 8000},
+	'elephant': {'pairs': ('stride', 4), 'period': 45, 'length': 40, ...},
+	'mice': {'pairs': ('stride', 4), 'start': 5, 'rounds': 4, 'interval': 5, ...},
+	'pins': [{'edge_stride': 2, 'match': 'tp_dst=40000', 'uplink': 'host'},],
+
+Hosts are indices in topo.HostList, and pairs are (client, server):
+('stride', n[, clients]) sends client i to (i + n) % hosts, ('random'[,
+clients]) draws a server per flow, ('explicit', [(client, server),]) lists
+them. Flows arrive in epochs every 'period' s, 'rounds' times 'interval' s
+apart from 'start', or as a Poisson process of 'rate' flows/s per pair.
+"""
+import logging
+import os
+import random
+import sys
+
+import flow_agent
+import setting
+
+
+logger = logging.getLogger('fileAndConsole')
+
+AGENT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'flow_agent.py')
+
+DEFAULT_OUTPUT = {
+	'elephant': 'e{label}_h{client}_{time}',
+	'mice': 'mice_flow/m{label}_h{client}_{time}',
+}
+
+SPEC_KEYS = set(['label', 'duration', 'seed', 'iperf_servers', 'http_servers',
+				 'elephant', 'mice', 'pins'])
+
+GROUP_KEYS = set(['pairs', 'arrival', 'rate', 'start', 'period', 'rounds', 'interval',
+				  'stagger', 'length', 'port', 'udp', 'parallel', 'bandwidth',
+				  'report_interval', 'output'])
+
+
+def _pairs(pairs, n, rng):
+	"""
+		Get [(client, server),] of a pairs spec among n hosts.
+	"""
+	kind = pairs[0]
+	if kind == 'explicit':
+		return list(pairs[1])
+	if kind == 'stride':
+		clients = pairs[2] if len(pairs) > 2 else range(n)
+		return [(c, (c + pairs[1]) % n) for c in clients]
+	if kind == 'random':
+		clients = pairs[1] if len(pairs) > 1 else range(n)
+		return [(c, rng.choice([s for s in range(n) if s != c])) for c in clients]
+	raise ValueError("unknown pairs %r" % (kind,))
+
+
+def _arrivals(group, n, duration, rng):
+	"""
+		Yield (time, client, server) of the flows of a group.
+	"""
+	start = group.get('start', 0)
+	if group.get('arrival', 'periodic') == 'poisson':
+		for client, server in _pairs(group['pairs'], n, rng):
+			t = start + rng.expovariate(group['rate'])
+			while t < duration:
+				yield t, client, server
+				t += rng.expovariate(group['rate'])
+		return
+	period = group.get('period')
+	epoch = 0
+	while epoch < duration:
+		pairs = _pairs(group['pairs'], n, rng)
+		for r in range(group.get('rounds', 1)):
+			for j, (client, server) in enumerate(pairs):
+				yield (epoch + start + r * group.get('interval', 0) +
+					   j * group.get('stagger', 0)), client, server
+		if not period:
+			break
+		epoch += period
+
+
+def _command(kind, group, ip, output, rng):
+	if kind == 'mice':
+		return 'wget %s:%d -o %s' % (ip, group.get('port', 8000), output)
+	length = group.get('length', 40)
+	if isinstance(length, (list, tuple)):
+		length = rng.randint(length[0], length[1])
+	cmd = 'iperf -c %s -p %d -t %d' % (ip, group.get('port', 40000), length)
+	if group.get('report_interval'):
+		cmd += ' -i %d' % group['report_interval']
+	if group.get('udp'):
+		cmd += ' -u'
+		if group.get('bandwidth'):
+			cmd += ' -b %s' % group['bandwidth']
+	if group.get('parallel', 1) > 1:
+		cmd += ' -P %d' % group['parallel']
+	return cmd + ' > %s' % output
+
+
+def compile_schedule(spec, ips):
+	"""
+		Compile spec for the hosts of ips into
+		{host index:[(time, command, output),],} sorted by time.
+		Output files are named after the start time, so a flow that would
+		reuse the name of another is delayed by 1 ms. Raise ValueError on
+		an invalid spec.
+	"""
+	unknown = set(spec) - SPEC_KEYS
+	for kind in ('elephant', 'mice'):
+		unknown |= set(spec.get(kind) or ()) - GROUP_KEYS
+	if unknown:
+		raise ValueError("unknown scenario keys %s" % ', '.join(sorted(unknown)))
+	rng = random.Random(spec.get('seed', 0))
+	schedule = dict((i, []) for i in range(len(ips)))
+	outputs = set()
+	for kind in ('elephant', 'mice'):
+		group = spec.get(kind)
+		if not group:
+			continue
+		pattern = group.get('output', DEFAULT_OUTPUT[kind])
+		for t, client, server in _arrivals(group, len(ips), spec['duration'], rng):
+			while True:
+				output = pattern.format(label=spec['label'], client=client + 1,
+										server=server + 1, time='%.3f' % t)
+				if output not in outputs:
+					break
+				t += 0.001
+			outputs.add(output)
+			schedule[client].append((t, _command(kind, group, ips[server], output, rng), output))
+	for entries in schedule.values():
+		entries.sort()
+	return schedule
+
+
+def _hosts(hosts, n):
+	return range(n) if hosts == 'all' else hosts
+
+
+def server_commands(spec, n):
+	"""
+		Get {host index:[command,],} of the iperf and HTTP servers.
+	"""
+	commands = {}
+	iperf = spec.get('iperf_servers')
+	if iperf:
+		for i in _hosts(iperf.get('hosts', 'all'), n):
+			cmd = 'iperf -s -p %d' % iperf.get('port', 40000)
+			if iperf.get('report_interval'):
+				cmd += ' -i %d' % iperf['report_interval']
+			if iperf.get('udp'):
+				cmd += ' -u'
+			output = iperf.get('output', 'server_report/server_report_h{host}').format(host=i + 1)
+			commands.setdefault(i, []).append(cmd + ' > %s' % output)
+	http = spec.get('http_servers')
+	if http:
+		for i in _hosts(http.get('hosts', 'all'), n):
+			commands.setdefault(i, []).append(
+				'python -m SimpleHTTPServer %d' % http.get('port', 8000))
+	return commands
+
+
+def pin_rules(topo, spec):
+	"""
+		Get {edge switch:[flow,],} of the static 'pins' of spec. A pin
+		sends host n of every edge e, towards host n of edge e + edge_stride,
+		through one uplink ('host': uplink n), at priority 50.
+	"""
+	rules = {}
+	edges = len(topo.EdgeSwitchList)
+	for pin in spec.get('pins', ()):
+		for e, sw in enumerate(topo.EdgeSwitchList):
+			dst = (e + pin['edge_stride']) % edges + 1
+			for n in range(1, topo.density + 1):
+				uplink = n if pin['uplink'] == 'host' else pin['uplink']
+				rules.setdefault(sw, []).append(
+					'table=0,priority=50,tcp,in_port=%d,nw_src=10.%d.0.%d,nw_dst=10.%d.0.%d,'
+					'%s,actions=output:%d' % (topo.pod/2 + n, e + 1, n, dst, n, pin['match'], uplink))
+	return rules
+
+
+def _make_dirs(schedule, spec, n):
+	paths = [output for entries in schedule.values() for (t, cmd, output) in entries]
+	paths += [cmd.rsplit('> ', 1)[-1] for cmds in server_commands(spec, n).values()
+			  for cmd in cmds if '> ' in cmd]
+	for directory in set(os.path.dirname(path) for path in paths):
+		if directory and not os.path.isdir(directory):
+			os.makedirs(directory)
+
+
+def _percentile(values, q):
+	values = sorted(values)
+	return values[min(len(values) - 1, int(q / 100.0 * len(values)))]
+
+
+def run(net, topo, spec):
+	"""
+		Start the servers of spec, stage the schedule of every host in
+		setting.SCHEDULE_DIR and start a flow_agent.py in each host, which
+		launches its flows at T0 + time on the shared monotonic clock.
+		T0 leaves setting.AGENT_LEAD s for the agents to start. Return the
+		launch skews (s) logged by the agents once the last flow started.
+	"""
+	hosts = [net.get(name) for name in topo.HostList]
+	schedule = compile_schedule(spec, [host.IP() for host in hosts])
+	_make_dirs(schedule, spec, len(hosts))
+	for i, cmds in server_commands(spec, len(hosts)).items():
+		hosts[i].cmd(' & '.join(cmds) + ' &')
+
+	if not os.path.isdir(setting.SCHEDULE_DIR):
+		os.makedirs(setting.SCHEDULE_DIR)
+	start = flow_agent.monotonic() + setting.AGENT_LEAD
+	logs = []
+	for i, entries in schedule.items():
+		if not entries:
+			continue
+		path = os.path.join(setting.SCHEDULE_DIR, '%s_%s' % (spec['label'], hosts[i].name))
+		flow_agent.save_schedule(path + '.jsonl', entries)
+		hosts[i].cmd('%s %s --start %.6f %s.jsonl %s.log > %s.out 2>&1 &' % (
+			sys.executable, AGENT, start, path, path, path))
+		logs.append(path + '.log')
+	last = max([entries[-1][0] for entries in schedule.values() if entries] or [0])
+	logger.info('scenario %s: %d flows over %d agents, last at %.1f s' % (
+		spec['label'], sum(len(entries) for entries in schedule.values()), len(logs), last))
+
+	flow_agent.sleep_until(start + last + 1)
+	skews = flow_agent.read_skews(logs)
+	if skews:
+		logger.info('scenario %s: launch skew mean %.4f s, p99 %.4f s, max %.4f s' % (
+			spec['label'], sum(skews) / len(skews), _percentile(skews, 99), max(skews)))
+	return skews
+
+
+ALL_HOSTS = {'hosts': 'all'}
+
+# Sinks h13/h15/h16 of the CT scenarios and their senders.
+CT_PAIRS = [(i, 12) for i in range(0, 4)] + [(i, 14) for i in range(4, 8)] + [(i, 15) for i in range(8, 12)]
+
+# h1/h2 and the hosts they exchange traffic with in the MD scenarios.
+MD_PAIRS = [(0, i) for i in (4, 6, 8, 10, 12)] + [(1, i) for i in (14, 5, 7, 11, 13)]
+
+SCENARIOS = {
+	# Elephants h_i -> h_(i+4) back to back, per-second server reports.
+	'UT_Test': {
+		'label': 'UT', 'duration': 300,
+		'iperf_servers': {'hosts': 'all', 'port': 5001, 'report_interval': 1,
+						  'output': 'UT_h{host}'},
+		'http_servers': ALL_HOSTS,
+		'elephant': {'pairs': ('stride', 4), 'period': 40, 'length': 40, 'port': 5001,
+					 'output': 'eUT_h{client}_{time}'},
+	},
+	# h1..h12 in turn: 4 wget rounds 10 s apart each.
+	'test': {
+		'label': 'T', 'duration': 1,
+		'iperf_servers': {'hosts': 'all', 'port': 5001, 'report_interval': 1,
+						  'output': 'UT_h{host}'},
+		'http_servers': ALL_HOSTS,
+		'mice': {'pairs': ('stride', 4, range(12)), 'start': 10, 'rounds': 4, 'interval': 10,
+				 'stagger': 40, 'output': 'mT_h{client}_{time}'},
+	},
+	# Incast of h1..h12 to h13/h15/h16, which fetch back from them.
+	'CT_test': {
+		'label': 'CT', 'duration': 300,
+		'iperf_servers': {'hosts': [12, 14, 15]},
+		'http_servers': {'hosts': range(12)},
+		'elephant': {'pairs': ('explicit', CT_PAIRS), 'period': 45, 'length': 40,
+					 'report_interval': 1},
+		'mice': {'pairs': ('explicit', [(s, c) for (c, s) in CT_PAIRS]), 'period': 45,
+				 'start': 5, 'rounds': 4, 'interval': 5,
+				 'output': 'mice_flow/mCT_h{server}_{time}'},
+	},
+	'u_my_test': {
+		'label': 'UCT', 'duration': 300,
+		'iperf_servers': {'hosts': [12, 14, 15], 'udp': True},
+		'http_servers': {'hosts': range(12)},
+		'elephant': {'pairs': ('explicit', CT_PAIRS), 'period': 20, 'length': 40,
+					 'report_interval': 1, 'udp': True, 'parallel': 2},
+		'mice': {'pairs': ('explicit', [(s, c) for (c, s) in CT_PAIRS]), 'period': 20,
+				 'start': 5, 'rounds': 4, 'interval': 5,
+				 'output': 'mice_flow/mUCT_h{server}_{time}'},
+	},
+	# Stride-4 elephants and mice between all hosts.
+	'ut_test': {
+		'label': 'ST', 'duration': 300,
+		'iperf_servers': ALL_HOSTS,
+		'http_servers': ALL_HOSTS,
+		'elephant': {'pairs': ('stride', 4), 'period': 45, 'length': 40, 'report_interval': 1},
+		'mice': {'pairs': ('stride', 4), 'period': 45, 'start': 5, 'rounds': 4, 'interval': 5},
+	},
+	'u_my_test2': {
+		'label': 'UST', 'duration': 300,
+		'iperf_servers': {'hosts': 'all', 'udp': True},
+		'http_servers': ALL_HOSTS,
+		'elephant': {'pairs': ('stride', 4), 'period': 16, 'length': 40, 'report_interval': 1,
+					 'udp': True, 'parallel': 2},
+		'mice': {'pairs': ('stride', 4), 'period': 16, 'start': 4, 'rounds': 4, 'interval': 4},
+	},
+	# Stride-4 with random elephant lengths, mice and elephants pinned
+	# to fixed uplinks of the edge switches.
+	'my_test3': {
+		'label': 'PST', 'duration': 300,
+		'iperf_servers': ALL_HOSTS,
+		'http_servers': ALL_HOSTS,
+		'elephant': {'pairs': ('stride', 4), 'period': 35, 'length': (40, 60),
+					 'report_interval': 1},
+		'mice': {'pairs': ('stride', 4), 'period': 35, 'start': 10, 'rounds': 3, 'interval': 10},
+		'pins': [{'edge_stride': 2, 'match': 'tp_src=8000', 'uplink': 1},
+				 {'edge_stride': 2, 'match': 'tp_dst=40000', 'uplink': 'host'}],
+	},
+	# Many-to-few between h1/h2 and ten hosts of the other pods.
+	'md_test': {
+		'label': 'MD', 'duration': 300,
+		'iperf_servers': ALL_HOSTS,
+		'http_servers': ALL_HOSTS,
+		'elephant': {'pairs': ('explicit', MD_PAIRS), 'period': 45, 'length': 40,
+					 'output': 'eMD_h{server}_{time}'},
+		'mice': {'pairs': ('explicit', [(s, c) for (c, s) in MD_PAIRS]), 'period': 45,
+				 'start': 5, 'rounds': 4, 'interval': 5},
+	},
+	'u_md_test': {
+		'label': 'UMD', 'duration': 300,
+		'iperf_servers': {'hosts': 'all', 'udp': True},
+		'http_servers': ALL_HOSTS,
+		'elephant': {'pairs': ('explicit', MD_PAIRS), 'period': 20, 'length': 40,
+					 'udp': True, 'parallel': 2, 'output': 'eUMD_h{server}_{time}'},
+		'mice': {'pairs': ('explicit', [(s, c) for (c, s) in MD_PAIRS]), 'period': 20,
+				 'start': 5, 'rounds': 4, 'interval': 5},
+	},
+	# h16/h15/h13 fetch once from each of h1..h12, 0.1 s apart.
+	'Test1': {
+		'label': 'TO', 'duration': 1,
+		'iperf_servers': {'hosts': [12, 14, 15]},
+		'http_servers': {'hosts': range(12)},
+		'mice': {'pairs': ('explicit', [(c, i) for i in range(12) for c in (15, 14, 12)]),
+				 'start': 10, 'stagger': 0.1, 'output': 'mice_flow/mTO_h{server}_{time}'},
+	},
+}
@@ -21,6 +21,60 @@
 
 DISCOVERY_PERIOD = 10   # For discovering topology.
 
-MONITOR_PERIOD = 4  # For monitoring traffic
+MONITOR_PERIOD = 4  # For monitoring traffic, initial port-stats interval of a switch
 
-TOSHOW = True	   # For showing information in terminal
+MONITOR_MIN_PERIOD = 2   # Port-stats interval of a loaded switch, seconds
+
+MONITOR_MAX_PERIOD = 10   # Port-stats interval of an idle switch, seconds
+
+MONITOR_TICK = 0.5   # Resolution of the per-switch monitor scheduler, seconds
+
+DEFAULT_PORT_CAPACITY = 20000   # Kbit/s, for ports whose curr_speed is not reported
+
+CONGESTION_UTILIZATION = 0.25   # Edge uplinks used above this fraction of their capacity get their reactive flows' stats requested
+
+CAPACITY_FILE = '/tmp/fattree_capacity.json'   # Port capacities written by fattree.py from the TCLink bw, overrides curr_speed
+
+TOSHOW = 1	   # 0: off, 1: topology/stat tables and counters, 2: sampled events, 3: all events (see telemetry.py)
+
+TELEMETRY_TARGET = '/tmp/fattree_telemetry.log'   # File, or 'udp://host:port', the telemetry batches go to
+
+TELEMETRY_SAMPLE = 10   # With TOSHOW = 2, record one in this many events of each kind
+
+TELEMETRY_BUFFER = 10000   # Events kept in memory between drains; the oldest are dropped first
+
+TELEMETRY_FLUSH_PERIOD = 1   # Seconds between telemetry drains
+
+PATH_PROVIDER = 'fattree'   # 'fattree' (closed-form, falls back to networkx) or 'networkx'
+
+PATH_INSTALL_MODE = 'barrier'   # 'none', 'barrier' or 'bundle' (OF1.3 ONF bundle + barrier)
+
+PROACTIVE_BUNDLE = False   # Load proactive flows with "ovs-ofctl --bundle" (bridges then also speak OpenFlow14)
+
+FATTREE_K = 4   # Switch fanout of the fat-tree.
+
+FATTREE_DENSITY = 2   # Hosts per edge switch.
+
+CONTROLLER_PROACTIVE = False   # Install proactive entries from the controller (proactive_installer.py) instead of fattree.py
+
+PROACTIVE_WAIT = 60   # With CONTROLLER_PROACTIVE, longest fattree.py waits for the entries on every switch before starting traffic, seconds
+
+ELEPHANT_RATE = 1000   # Kbit/s a flow has to sustain to be rescheduled as an elephant
+
+ELEPHANT_SUSTAIN = 2   # Consecutive flow-stats rates (between two samples) at or above ELEPHANT_RATE
+
+FLOW_IDLE_PERIODS = 3   # Poll intervals of its switch before an unseen flow is dropped from NetworkMonitor.flow_speed
+
+FLOW_STATS_TIMEOUT = 2   # Seconds before an unanswered flow-stats request for a port may be re-sent
+
+PENDING_FLOW_TTL = 1   # Seconds duplicate packet-ins of a flow being installed are only packet-out
+
+PACKET_IN_RATE = 500   # Packet-ins per second handled per switch by main.py
+
+PACKET_IN_BURST = 100   # Packet-ins a switch may burst above PACKET_IN_RATE
+
+MICE_AGGREGATION = False   # Share one /16 entry per destination edge among mice (tcp_dst 8000) flows on shortest paths
+
+SCHEDULE_DIR = '/tmp/fattree_schedule'   # Per-host schedules and flow_agent.py launch logs of a scenario
+
+AGENT_LEAD = 2   # Seconds between staging the flow agents and the first launch
@@ -0,0 +1,130 @@
+"""
+Telemetry sink of the controller apps.
+Handlers only bump counters, set gauges or append sampled event records
+to a bounded ring buffer; a green thread drains the buffer in batches of
+JSON lines to a file (or a UDP socket), so the hub never blocks on
+console output.
+"""
+import json
+import socket
+import time
+from collections import deque
+
+from ryu.lib import hub
+
+import setting
+
+
+LEVEL_OFF = 0   # Nothing is recorded or shown.
+LEVEL_SUMMARY = 1   # Counters, gauges and the topology/stat tables.
+LEVEL_EVENTS = 2   # Plus one in setting.TELEMETRY_SAMPLE event records.
+LEVEL_DEBUG = 3   # Plus every event record.
+
+_telemetry = None
+
+
+def get_telemetry():
+	"""
+		Get the Telemetry shared by all apps, starting it on first use.
+	"""
+	global _telemetry
+	if _telemetry is None:
+		_telemetry = Telemetry(setting.TELEMETRY_TARGET, setting.TOSHOW,
+							   setting.TELEMETRY_SAMPLE, setting.TELEMETRY_BUFFER)
+		_telemetry.start(setting.TELEMETRY_FLUSH_PERIOD)
+	return _telemetry
+
+
+class Telemetry(object):
+	"""
+		self.counters = {name:count,}
+		self.gauges = {name:value,}
+		self.buffer = deque([(time, name, fields),], maxlen=size)
+		target: a file path, or 'udp://host:port'.
+	"""
+
+	def __init__(self, target, level=LEVEL_SUMMARY, sample=10, size=10000):
+		self.target = target
+		self.level = level
+		self.sample = max(int(sample), 1)
+		self.counters = {}
+		self.gauges = {}
+		self.seen = {}              # {event name:number of calls,} for sampling
+		self.buffer = deque(maxlen=size)
+		self.dropped = 0
+		self.changed = False
+		self.sock = None
+		self.addr = None
+		if target and target.startswith('udp://'):
+			host, port = target[len('udp://'):].rsplit(':', 1)
+			self.addr = (host, int(port))
+			self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+			self.sock.setblocking(False)
+
+	def enabled(self, level):
+		return self.level >= level
+
+	def incr(self, name, n=1):
+		if self.level >= LEVEL_SUMMARY:
+			self.counters[name] = self.counters.get(name, 0) + n
+			self.changed = True
+
+	def gauge(self, name, value):
+		if self.level >= LEVEL_SUMMARY:
+			self.gauges[name] = value
+			self.changed = True
+
+	def event(self, name, **fields):
+		"""
+			Record an event. At LEVEL_EVENTS only every sample-th event
+			of each name is kept; at LEVEL_DEBUG all of them.
+		"""
+		if self.level < LEVEL_EVENTS:
+			return
+		n = self.seen.get(name, 0)
+		self.seen[name] = n + 1
+		if self.level < LEVEL_DEBUG and n % self.sample:
+			return
+		if len(self.buffer) == self.buffer.maxlen:
+			self.dropped += 1
+		self.buffer.append((time.time(), name, fields))
+
+	def start(self, period):
+		if self.target and self.level > LEVEL_OFF:
+			hub.spawn(self._drain_loop, period)
+
+	def _drain_loop(self, period):
+		while True:
+			hub.sleep(period)
+			self.drain()
+
+	def drain(self):
+		"""
+			Write all buffered events, and counters/gauges if they changed,
+			as one batch. Return the number of lines written.
+		"""
+		lines = []
+		while self.buffer:
+			t, name, fields = self.buffer.popleft()
+			record = {'t': round(t, 6), 'event': name}
+			record.update(fields)
+			lines.append(json.dumps(record))
+		if self.changed:
+			lines.append(json.dumps({'t': round(time.time(), 6), 'counters': self.counters,
+									 'gauges': self.gauges, 'dropped': self.dropped}))
+			self.changed = False
+		if lines:
+			self._write(lines)
+		return len(lines)
+
+	def _write(self, lines):
+		if self.sock is not None:
+			# One datagram per record; a full socket buffer drops it.
+			for line in lines:
+				try:
+					self.sock.sendto(line.encode('utf-8'), self.addr)
+				except socket.error:
+					self.dropped += 1
+			return
+		with open(self.target, 'a') as f:
+			f.write('\n'.join(lines) + '\n')